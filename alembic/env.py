@@ -1,10 +1,15 @@
+import asyncio
 from logging.config import fileConfig
-from sqlalchemy import engine_from_config, pool
+from sqlalchemy import pool
+from sqlalchemy.ext.asyncio import create_async_engine
 from alembic import context
 
+from app.core.config import settings
+
 # ✅ импортируем Base из твоего проекта
 from app.db.session import Base
-from app.models import admin, user, university, direction, kafedra, subject, literature
+from app.models import admin, user, university, direction, kafedra, subject, literature, news, tag
+from app.models.news import NEWS_FTS_INDEX, NEWS_FTS_TABLE
 
 
 # эта строка подключает конфигурацию логирования
@@ -16,6 +21,16 @@ if config.config_file_name is not None:
 target_metadata = Base.metadata
 
 
+def include_object(obj, name, type_, reflected, compare_to):
+    # Поиск по новостям создаётся DDL в обход метаданных (FTS5 news_fts + служебные news_fts_*,
+    # GIN-индекс по выражению) — autogenerate не должен предлагать их удалить
+    if type_ == "table" and name.startswith(NEWS_FTS_TABLE):
+        return False
+    if type_ == "index" and name == NEWS_FTS_INDEX:
+        return False
+    return True
+
+
 def run_migrations_offline():
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
@@ -23,27 +38,36 @@ def run_migrations_offline():
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
         context.run_migrations()
 
 
-def run_migrations_online():
-    connectable = engine_from_config(
-        config.get_section(config.config_ini_section),
-        prefix="sqlalchemy.",
-        poolclass=pool.NullPool,
+def do_run_migrations(connection):
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
     )
 
-    with connectable.connect() as connection:
-        context.configure(
-            connection=connection,
-            target_metadata=target_metadata
-        )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_async_migrations():
+    # ✅ мигрируем ту же БД, с которой работает приложение (DATABASE_URL из .env)
+    connectable = create_async_engine(settings.DATABASE_URL, poolclass=pool.NullPool)
+
+    async with connectable.connect() as connection:
+        await connection.run_sync(do_run_migrations)
 
-        with context.begin_transaction():
-            context.run_migrations()
+    await connectable.dispose()
+
+
+def run_migrations_online():
+    asyncio.run(run_async_migrations())
 
 
 if context.is_offline_mode():
@@ -18,41 +18,60 @@ branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
 
+# Автосгенерированная версия вызывала drop_constraint(None, ...) и падала на любой БД, поэтому ни одна
+# БД её не прошла (БД от create_all ставятся stamp'ом сразу на эту ревизию). FK в 8d539ac424a8 без имён:
+# PostgreSQL называет их <таблица>_<колонка>_fkey, а в batch-режиме SQLite то же имя даёт naming_convention
+NAMING_CONVENTION = {
+    'fk': '%(table_name)s_%(column_0_name)s_fkey',
+    'uq': '%(table_name)s_%(column_0_name)s_key',
+}
+
+# таблица -> [(колонка, на какую таблицу ссылается)] — FK, которым нужен ON DELETE CASCADE
+CASCADE_FKS = {
+    'directions': [('university_id', 'universities')],
+    'kafedras': [('university_id', 'universities')],
+    'literature': [('subject_id', 'subjects')],
+    'subject_directions': [('subject_id', 'subjects'), ('direction_id', 'directions')],
+    'subjects': [('university_id', 'universities'), ('kafedra_id', 'kafedras')],
+}
+
+
+def _replace_foreign_keys(ondelete: Union[str, None]) -> None:
+    for table, fks in CASCADE_FKS.items():
+        with op.batch_alter_table(table, naming_convention=NAMING_CONVENTION) as batch_op:
+            for column, referent in fks:
+                name = f'{table}_{column}_fkey'
+                batch_op.drop_constraint(name, type_='foreignkey')
+                batch_op.create_foreign_key(name, referent, [column], ['id'], ondelete=ondelete)
+
+
 def upgrade() -> None:
     """Upgrade schema."""
-    # ### commands auto generated by Alembic - please adjust! ###
-    op.drop_constraint(None, 'directions', type_='foreignkey')
-    op.create_foreign_key(None, 'directions', 'universities', ['university_id'], ['id'], ondelete='CASCADE')
-    op.drop_constraint(None, 'kafedras', type_='foreignkey')
-    op.create_foreign_key(None, 'kafedras', 'universities', ['university_id'], ['id'], ondelete='CASCADE')
-    op.drop_constraint(None, 'literature', type_='foreignkey')
-    op.create_foreign_key(None, 'literature', 'subjects', ['subject_id'], ['id'], ondelete='CASCADE')
-    op.drop_constraint(None, 'subject_directions', type_='foreignkey')
-    op.drop_constraint(None, 'subject_directions', type_='foreignkey')
-    op.create_foreign_key(None, 'subject_directions', 'subjects', ['subject_id'], ['id'], ondelete='CASCADE')
-    op.create_foreign_key(None, 'subject_directions', 'directions', ['direction_id'], ['id'], ondelete='CASCADE')
-    op.drop_constraint(None, 'subjects', type_='foreignkey')
-    op.drop_constraint(None, 'subjects', type_='foreignkey')
-    op.create_foreign_key(None, 'subjects', 'universities', ['university_id'], ['id'], ondelete='CASCADE')
-    op.create_foreign_key(None, 'subjects', 'kafedras', ['kafedra_id'], ['id'], ondelete='CASCADE')
-    # ### end Alembic commands ###
+    _replace_foreign_keys('CASCADE')
+
+    # остальное, чем модели к этой ревизии отличались от 8d539ac424a8
+    with op.batch_alter_table('directions', naming_convention=NAMING_CONVENTION) as batch_op:
+        batch_op.drop_constraint('directions_number_key', type_='unique')
+        batch_op.alter_column('number', existing_type=sa.Integer(), type_=sa.String(), existing_nullable=False)
+    with op.batch_alter_table('subjects') as batch_op:
+        batch_op.alter_column('kafedra_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.alter_column('university_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_unique_constraint(
+            'uq_subject_name_kafedra_university', ['name', 'kafedra_id', 'university_id']
+        )
 
 
 def downgrade() -> None:
     """Downgrade schema."""
-    # ### commands auto generated by Alembic - please adjust! ###
-    op.drop_constraint(None, 'subjects', type_='foreignkey')
-    op.drop_constraint(None, 'subjects', type_='foreignkey')
-    op.create_foreign_key(None, 'subjects', 'kafedras', ['kafedra_id'], ['id'])
-    op.create_foreign_key(None, 'subjects', 'universities', ['university_id'], ['id'])
-    op.drop_constraint(None, 'subject_directions', type_='foreignkey')
-    op.drop_constraint(None, 'subject_directions', type_='foreignkey')
-    op.create_foreign_key(None, 'subject_directions', 'directions', ['direction_id'], ['id'])
-    op.create_foreign_key(None, 'subject_directions', 'subjects', ['subject_id'], ['id'])
-    op.drop_constraint(None, 'literature', type_='foreignkey')
-    op.create_foreign_key(None, 'literature', 'subjects', ['subject_id'], ['id'])
-    op.drop_constraint(None, 'kafedras', type_='foreignkey')
-    op.create_foreign_key(None, 'kafedras', 'universities', ['university_id'], ['id'])
-    op.drop_constraint(None, 'directions', type_='foreignkey')
-    op.create_foreign_key(None, 'directions', 'universities', ['university_id'], ['id'])
-    # ### end Alembic commands ###
+    with op.batch_alter_table('subjects') as batch_op:
+        batch_op.drop_constraint('uq_subject_name_kafedra_university', type_='unique')
+        batch_op.alter_column('university_id', existing_type=sa.Integer(), nullable=True)
+        batch_op.alter_column('kafedra_id', existing_type=sa.Integer(), nullable=True)
+    with op.batch_alter_table('directions', naming_convention=NAMING_CONVENTION) as batch_op:
+        batch_op.alter_column(
+            'number', existing_type=sa.String(), type_=sa.Integer(), existing_nullable=False,
+            postgresql_using='number::integer',
+        )
+        batch_op.create_unique_constraint('directions_number_key', ['number'])
+
+    _replace_foreign_keys(None)
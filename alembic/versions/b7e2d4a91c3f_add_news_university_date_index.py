@@ -0,0 +1,33 @@
+"""add news university date index
+
+Revision ID: b7e2d4a91c3f
+Revises: f35615090a90
+Create Date: 2026-10-19 19:20:14.318402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2d4a91c3f'
+down_revision: Union[str, Sequence[str], None] = 'f35615090a90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keyset-лента университета: WHERE university_id = ? AND (date, id) < (?, ?) ORDER BY date DESC, id DESC
+    op.create_index(
+        'ix_news_university_id_date', 'news',
+        ['university_id', sa.text('date DESC'), sa.text('id DESC')],
+        unique=False, if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_news_university_id_date', table_name='news', if_exists=True)
@@ -0,0 +1,31 @@
+"""add news img variants
+
+Revision ID: c4f8a2e6d913
+Revises: b7e2d4a91c3f
+Create Date: 2026-10-19 19:48:37.902115
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4f8a2e6d913'
+down_revision: Union[str, Sequence[str], None] = 'b7e2d4a91c3f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # БД от create_all (stamp на 35dc13600de8) колонку уже имеет
+    if 'img_variants' not in {c['name'] for c in sa.inspect(op.get_bind()).get_columns('news')}:
+        op.add_column('news', sa.Column('img_variants', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('news') as batch_op:
+        batch_op.drop_column('img_variants')
@@ -0,0 +1,52 @@
+"""add tag stats
+
+Revision ID: d91e3b7f5a28
+Revises: c4f8a2e6d913
+Create Date: 2026-10-19 20:14:52.661930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd91e3b7f5a28'
+down_revision: Union[str, Sequence[str], None] = 'c4f8a2e6d913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # БД от create_all (stamp на 35dc13600de8) таблицу уже имеет, а счётчики в ней ведёт приложение
+    if sa.inspect(op.get_bind()).has_table('tag_stats'):
+        return
+
+    op.create_table(
+        'tag_stats',
+        sa.Column('university_id', sa.Integer(), nullable=False),
+        sa.Column('tag_id', sa.Integer(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['tag_id'], ['tags.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('university_id', 'tag_id'),
+    )
+    op.create_index('ix_tag_stats_university_id_count', 'tag_stats', ['university_id', 'count'], unique=False)
+
+    # Начальные значения из существующих связей; university_id = 0 — по всем университетам
+    op.execute(
+        "INSERT INTO tag_stats (university_id, tag_id, count) "
+        "SELECT news.university_id, news_tags.tag_id, COUNT(*) FROM news_tags "
+        "JOIN news ON news.id = news_tags.news_id GROUP BY news.university_id, news_tags.tag_id"
+    )
+    op.execute(
+        "INSERT INTO tag_stats (university_id, tag_id, count) "
+        "SELECT 0, tag_id, COUNT(*) FROM news_tags GROUP BY tag_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tag_stats_university_id_count', table_name='tag_stats')
+    op.drop_table('tag_stats')
@@ -0,0 +1,52 @@
+"""add news full text search
+
+Revision ID: e5a7c9d3f146
+Revises: d91e3b7f5a28
+Create Date: 2026-10-19 20:41:08.274519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a7c9d3f146'
+down_revision: Union[str, Sequence[str], None] = 'd91e3b7f5a28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Копия DDL из app/models/news.py на момент ревизии: миграция не должна меняться вместе с моделью.
+# Новое выражение поиска — новая ревизия (запрос совпадает с индексом, только пока совпадает выражение)
+NEWS_FTS_INDEX = 'ix_news_fts'
+NEWS_FTS_TABLE = 'news_fts'
+NEWS_FTS_POSTGRESQL_DDL = (
+    "CREATE INDEX IF NOT EXISTS ix_news_fts ON news USING gin "
+    "(to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, '')))"
+)
+NEWS_FTS_SQLITE_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS news_fts "
+    "USING fts5(title, description, tokenize='unicode61 remove_diacritics 2')"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # PostgreSQL: GIN по выражению — индекс обновляется сам; запрос обязан использовать то же выражение
+    # SQLite: FTS5-таблица, rowid = news.id; дальше её ведёт роутер новостей
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(NEWS_FTS_POSTGRESQL_DDL)
+    elif not sa.inspect(op.get_bind()).has_table(NEWS_FTS_TABLE):
+        # у БД от create_all таблица уже есть и заполнена — повторная вставка упала бы на rowid
+        op.execute(NEWS_FTS_SQLITE_DDL)
+        op.execute(f"INSERT INTO {NEWS_FTS_TABLE} (rowid, title, description) SELECT id, title, description FROM news")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(f"DROP INDEX IF EXISTS {NEWS_FTS_INDEX}")
+    else:
+        op.execute(f"DROP TABLE IF EXISTS {NEWS_FTS_TABLE}")
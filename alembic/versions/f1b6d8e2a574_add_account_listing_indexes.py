@@ -0,0 +1,47 @@
+"""add account listing indexes
+
+Revision ID: f1b6d8e2a574
+Revises: e5a7c9d3f146
+Create Date: 2026-10-19 21:05:33.517206
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1b6d8e2a574'
+down_revision: Union[str, Sequence[str], None] = 'e5a7c9d3f146'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (индекс, таблица, колонка) — поиск по префиксу: lower(col) LIKE 'q%'
+PREFIX_INDEXES = [
+    ('ix_users_lower_email', 'users', 'email'),
+    ('ix_users_lower_first_name', 'users', 'first_name'),
+    ('ix_users_lower_last_name', 'users', 'last_name'),
+    ('ix_admins_lower_email', 'admins', 'email'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # фильтр по университету + keyset по id
+    op.create_index('ix_users_university_id_id', 'users', ['university_id', 'id'], unique=False, if_not_exists=True)
+    op.create_index('ix_admins_university_id_id', 'admins', ['university_id', 'id'], unique=False, if_not_exists=True)
+
+    # PostgreSQL использует btree для LIKE 'q%' только с text_pattern_ops (при не-C collation)
+    ops = ' text_pattern_ops' if op.get_bind().dialect.name == 'postgresql' else ''
+    for name, table, column in PREFIX_INDEXES:
+        op.create_index(name, table, [sa.text(f'lower({column}){ops}')], unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in reversed(PREFIX_INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
+    op.drop_index('ix_admins_university_id_id', table_name='admins', if_exists=True)
+    op.drop_index('ix_users_university_id_id', table_name='users', if_exists=True)
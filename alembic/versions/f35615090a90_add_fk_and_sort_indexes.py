@@ -0,0 +1,127 @@
+"""add fk and sort indexes
+
+Revision ID: f35615090a90
+Revises: 35dc13600de8
+Create Date: 2026-10-19 10:12:41.508113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f35615090a90'
+down_revision: Union[str, Sequence[str], None] = '35dc13600de8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (таблица, колонка) — индексы под фильтры, каскадные удаления и join'ы в роутерах
+INDEXES = [
+    ('literature', 'subject_id'),
+    ('literature', 'university_id'),
+    ('subjects', 'university_id'),
+    ('subjects', 'kafedra_id'),
+    ('directions', 'university_id'),
+    ('kafedras', 'university_id'),
+    ('news', 'university_id'),
+    ('news', 'date'),
+    ('news_tags', 'tag_id'),
+    ('subject_directions', 'direction_id'),
+]
+
+
+def _create_missing_objects() -> None:
+    """Таблицы и колонки моделей, которых нет ни в одной ревизии до этой: у БД от create_all
+    они уже есть, у БД, собранной одними миграциями, — нет. Создаём в том же виде, что create_all."""
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+
+    user_columns = {c['name'] for c in inspector.get_columns('users')}
+    if 'is_active' not in user_columns:
+        op.add_column('users', sa.Column('is_active', sa.Boolean(), nullable=True))
+        op.execute(sa.text("UPDATE users SET is_active = :active").bindparams(active=True))
+    if 'university_id' not in user_columns:
+        with op.batch_alter_table('users') as batch_op:
+            batch_op.add_column(sa.Column('university_id', sa.Integer(), nullable=True))
+            batch_op.create_foreign_key('users_university_id_fkey', 'universities', ['university_id'], ['id'])
+
+    if 'university_id' not in {c['name'] for c in inspector.get_columns('literature')}:
+        with op.batch_alter_table('literature') as batch_op:
+            batch_op.add_column(sa.Column('university_id', sa.Integer(), nullable=True))
+            batch_op.create_foreign_key('literature_university_id_fkey', 'universities', ['university_id'], ['id'])
+
+    if 'tags' not in tables:
+        op.create_table(
+            'tags',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('name'),
+        )
+        op.create_index(op.f('ix_tags_id'), 'tags', ['id'], unique=False)
+
+    if 'news' not in tables:
+        op.create_table(
+            'news',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('img', sa.String(), nullable=True),
+            sa.Column('title', sa.String(), nullable=False),
+            sa.Column('description', sa.Text(), nullable=False),
+            sa.Column('date', sa.DateTime(), nullable=True),
+            sa.Column('university_id', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['university_id'], ['universities.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index(op.f('ix_news_id'), 'news', ['id'], unique=False)
+
+    # без PK, как у create_all до этой ревизии: PK добавляется ниже для обоих случаев
+    if 'news_tags' not in tables:
+        op.create_table(
+            'news_tags',
+            sa.Column('news_id', sa.Integer(), nullable=True),
+            sa.Column('tag_id', sa.Integer(), nullable=True),
+            sa.ForeignKeyConstraint(['news_id'], ['news.id'], ondelete='CASCADE'),
+            sa.ForeignKeyConstraint(['tag_id'], ['tags.id'], ondelete='CASCADE'),
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _create_missing_objects()
+
+    # Таблицы могли быть созданы через create_all — индекс мог уже появиться
+    for table, column in INDEXES:
+        op.create_index(op.f(f'ix_{table}_{column}'), table, [column], unique=False, if_not_exists=True)
+
+    # news_tags без первичного ключа: убираем дубли/NULL и добавляем PK (news_id, tag_id),
+    # он же покрывает выборку тегов по news_id
+    op.execute("DELETE FROM news_tags WHERE news_id IS NULL OR tag_id IS NULL")
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(
+            "DELETE FROM news_tags a USING news_tags b "
+            "WHERE a.ctid < b.ctid AND a.news_id = b.news_id AND a.tag_id = b.tag_id"
+        )
+    else:
+        op.execute(
+            "DELETE FROM news_tags WHERE rowid NOT IN "
+            "(SELECT MIN(rowid) FROM news_tags GROUP BY news_id, tag_id)"
+        )
+    with op.batch_alter_table('news_tags') as batch_op:
+        batch_op.alter_column('news_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.alter_column('tag_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_primary_key('news_tags_pkey', ['news_id', 'tag_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # таблицы и колонки из _create_missing_objects не удаляем: в БД от create_all это живые данные
+    with op.batch_alter_table('news_tags') as batch_op:
+        batch_op.drop_constraint('news_tags_pkey', type_='primary')
+        batch_op.alter_column('tag_id', existing_type=sa.Integer(), nullable=True)
+        batch_op.alter_column('news_id', existing_type=sa.Integer(), nullable=True)
+
+    for table, column in reversed(INDEXES):
+        op.drop_index(op.f(f'ix_{table}_{column}'), table_name=table, if_exists=True)
@@ -1,3 +1,4 @@
+from typing import List, Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -7,6 +8,98 @@ class Settings(BaseSettings):
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     ALGORITHM: str = "HS256"
 
+    # ---- Отладка: заголовки X-DB-* с числом SQL-запросов, предупреждения о N+1 ----
+    DEBUG: bool = False
+    N_PLUS_ONE_THRESHOLD: int = 3  # одинаковый запрос N+ раз за HTTP-запрос
+
+    # ---- Окружение: выбирает профиль пула БД ("dev" | "test" | "prod") ----
+    ENVIRONMENT: str = "dev"
+
+    # ---- Схема при старте: "check" — сверить ревизию Alembic, "create_all" — только для локальной разработки/тестов ----
+    #   новая БД: `alembic upgrade head`; БД от прежнего create_all (test.db) без alembic_version:
+    #   `alembic stamp 35dc13600de8 && alembic upgrade head` (см. app/db/migrations.py)
+    SCHEMA_STARTUP_MODE: str = "check"  # "check" | "create_all" | "off"
+
+    # ---- Движок БД (None → значение из профиля окружения) ----
+    DB_POOL_SIZE: Optional[int] = None
+    DB_MAX_OVERFLOW: Optional[int] = None
+    DB_POOL_TIMEOUT: Optional[int] = None
+    DB_POOL_RECYCLE: Optional[int] = None
+    DB_POOL_PRE_PING: Optional[bool] = None
+    DB_STATEMENT_CACHE_SIZE: Optional[int] = None  # asyncpg prepared statements, 0 — выкл (pgbouncer)
+    DB_ECHO: Optional[bool] = None
+    DB_SLOW_QUERY_MS: Optional[float] = None  # 0 — не логировать медленные запросы
+    SLOW_QUERY_LOG_SIZE: int = 200  # кольцевой буфер /diagnostics/slow-queries
+    SLOW_QUERY_EXPLAIN: bool = True
+    SLOW_QUERY_EXPLAIN_ANALYZE: bool = True  # Postgres: EXPLAIN (ANALYZE, BUFFERS) для SELECT
+
+    # ---- Read-реплики (через запятую; пусто — всё читается с primary) ----
+    DATABASE_REPLICA_URLS: str = ""
+    REPLICA_STICKY_SECONDS: int = 5  # после записи клиент читает с primary
+    REPLICA_RETRY_SECONDS: int = 30  # сколько не трогать упавшую реплику
+
+    # ---- Общий Redis (для backend'ов, разделяемых между воркерами) ----
+    REDIS_URL: str = "redis://localhost:6379/0"
+
+    # ---- Rate limit для /auth (token bucket: burst + пополнение в минуту) ----
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "memory"  # "memory" | "redis"
+    RATE_LIMIT_MAX_KEYS: int = 100_000
+    RATE_LIMIT_TRUST_PROXY: bool = False  # брать IP из X-Forwarded-For
+    AUTH_IP_BURST: int = 20
+    AUTH_IP_PER_MINUTE: int = 10
+    AUTH_EMAIL_BURST: int = 5
+    AUTH_EMAIL_PER_MINUTE: int = 3
+
+    # ---- Кэш публичных списков (ETag / If-None-Match) ----
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_BACKEND: str = "memory"  # "memory" | "redis" (общий для нескольких воркеров)
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1000
+    RESPONSE_CACHE_TTL: int = 300  # страховка от записей в обход API (миграции, ручные правки)
+
+    # ---- GET /news/ (keyset-пагинация) ----
+    NEWS_PAGE_SIZE: int = 20
+    NEWS_PAGE_MAX: int = 100
+
+    # ---- Картинки новостей (нужен Pillow; без него отдаётся оригинал) ----
+    NEWS_IMAGE_PROCESSING: bool = True
+    NEWS_IMAGE_WIDTHS: List[int] = [320, 640, 1280]
+    NEWS_IMAGE_WEBP_QUALITY: int = 80
+    NEWS_IMAGE_JPEG_QUALITY: int = 82
+    NEWS_IMAGE_QUEUE_SIZE: int = 100
+    NEWS_IMAGE_SHUTDOWN_TIMEOUT: float = 10.0  # сколько ждать недоделанную очередь при остановке
+
+    # ---- Списки пользователей и админов (keyset по id) ----
+    ACCOUNTS_PAGE_SIZE: int = 50
+    ACCOUNTS_PAGE_MAX: int = 500
+
+    # ---- Subjects ----
+    SUBJECTS_PAGE_MAX: int = 1000  # верхняя граница ?limit= у списков
+    SUBJECTS_BULK_LIMIT: int = 5000  # JSON-массив целиком в памяти
+    SUBJECTS_BULK_STREAM_LIMIT: int = 100_000  # /subjects/bulk/stream (NDJSON)
+    SUBJECTS_BULK_CHUNK: int = 1000  # строк на проверку/INSERT (лимит параметров драйвера)
+
+    # ---- Лента изменений (SSE /events/stream) ----
+    CHANGE_FEED_BACKEND: str = "memory"  # "memory" | "redis" (pub/sub между воркерами)
+    CHANGE_FEED_MAX_SUBSCRIBERS: int = 10_000  # на процесс
+    CHANGE_FEED_QUEUE_SIZE: int = 100  # переполнение → клиенту событие resync
+    CHANGE_FEED_HEARTBEAT_SECONDS: int = 20
+    CHANGE_FEED_RETRY_MS: int = 5000
+
+    # ---- Сжатие ответов (zstd/br — если установлены zstandard/brotli) ----
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024  # байт; меньше — заголовки дороже экономии
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4  # 10-11 слишком медленные для динамических ответов
+    COMPRESSION_ZSTD_LEVEL: int = 3
+
+    # ---- Хеширование паролей ----
+    PASSWORD_HASH_PROFILE: str = "bcrypt"  # "bcrypt" | "argon2id"
+    BCRYPT_ROUNDS: int = 12
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536  # KiB
+    ARGON2_PARALLELISM: int = 4
+
     class Config:
         env_file = ".env"
 
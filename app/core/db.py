@@ -1,16 +0,0 @@
-# app/db/session.py
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
-from app.core.config import settings  # твой .env
-
-DATABASE_URL = settings.DATABASE_URL
-
-engine = create_async_engine(DATABASE_URL, echo=True, future=True)
-async_session = sessionmaker(
-    engine, expire_on_commit=False, class_=AsyncSession
-)
-
-# Функция-зависимость для FastAPI
-async def get_db() -> AsyncSession:
-    async with async_session() as session:
-        yield session
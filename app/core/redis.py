@@ -0,0 +1,15 @@
+from app.core.config import settings
+
+_client = None
+
+
+def get_redis():
+    """Общий async-клиент Redis. Пакет redis — опциональная зависимость."""
+    global _client
+    if _client is None:
+        try:
+            from redis import asyncio as aioredis
+        except ImportError as exc:
+            raise RuntimeError("Redis backend requires the 'redis' package (pip install redis)") from exc
+        _client = aioredis.from_url(settings.REDIS_URL)
+    return _client
@@ -0,0 +1,35 @@
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.types import NullType
+
+
+# ======================
+# Агрегация id по диалекту
+# ======================
+class aggregate_ids(FunctionElement):
+    """Список id группы одним столбцом: array_agg на PostgreSQL, group_concat на SQLite.
+    NULL от LEFT JOIN без пары в агрегат не попадает; разбирать через split_ids()."""
+
+    type = NullType()
+    name = "aggregate_ids"
+    inherit_cache = True
+
+
+@compiles(aggregate_ids)
+def _aggregate_ids_default(element, compiler, **kw):
+    return "group_concat(%s)" % compiler.process(element.clauses, **kw)
+
+
+@compiles(aggregate_ids, "postgresql")
+def _aggregate_ids_postgresql(element, compiler, **kw):
+    column = compiler.process(element.clauses, **kw)
+    return f"array_remove(array_agg({column} ORDER BY {column}), NULL)"
+
+
+def split_ids(value) -> list[int]:
+    """Результат aggregate_ids -> отсортированный список int (list на PostgreSQL, '3,1' на SQLite)."""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(",")
+    return sorted(int(v) for v in value)
@@ -0,0 +1,162 @@
+# Проверка планов горячих запросов роутеров на засеянной БД:
+#   python -m app.db.explain_check                      # SQLite в памяти
+#   python -m app.db.explain_check --url postgresql+asyncpg://...  (пустая БД)
+# Код выхода 1, если какой-то запрос уходит в полный скан таблицы (то же проверяет tests/test_explain_plans.py).
+import argparse
+import asyncio
+import random
+import sys
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db.session import Base
+from app.models import University, Direction, Kafedra, Subject, Literature, News, Tag
+from app.models.subject import subject_directions
+from app.models.tag import news_tags
+
+
+def hot_queries() -> dict:
+    """Запросы-фильтры — теми же построителями, что и в роутерах (списки «всё подряд» сюда
+    не входят — там скан ожидаем). Импорт внутри: роутеры тянут за собой всё приложение."""
+    from app.db.loaders import news_tags_query
+    from app.routers.news import _feed_query
+    from app.routers.subject import _coverage_query, _subject_rows_query
+    from app.routers.university import _tree_queries
+    from app.utils.tag_stats import top_tags_query
+
+    tree = _tree_queries(1)
+    return {
+        "subjects by university": _subject_rows_query(1, None, None, 100, 0),
+        "subjects by kafedra": _subject_rows_query(None, 1, None, 100, 0),
+        "subjects by direction": _subject_rows_query(None, None, 1, 100, 0),
+        "subject coverage by university": _coverage_query(1, None, False)[0].limit(100),
+        "tree directions": tree["directions"],
+        "tree kafedras": tree["kafedras"],
+        "tree subjects": tree["subjects"],
+        "tree links": tree["links"],
+        "news feed by university": _feed_query(1, [], "any", None, 21),
+        "news feed by tag": _feed_query(None, ["tag-1"], "any", None, 21),
+        "news feed by university and tags (all)": _feed_query(1, ["tag-1", "tag-2"], "all", None, 21),
+        "tags of news": news_tags_query([1, 2, 3]),
+        "top tags of university": top_tags_query(1, 20),
+    }
+
+
+async def seed(conn, universities: int = 5, scale: int = 20) -> None:
+    rnd = random.Random(42)
+    now = datetime(2025, 1, 1)
+    await conn.execute(insert(University), [{"id": u, "name": f"University {u}"} for u in range(1, universities + 1)])
+    await conn.execute(insert(Tag), [{"id": t, "name": f"tag-{t}"} for t in range(1, scale + 1)])
+
+    directions, kafedras, subjects, links, literature, news, tags = [], [], [], [], [], [], []
+    for u in range(1, universities + 1):
+        for i in range(scale):
+            directions.append({"id": len(directions) + 1, "number": f"{u}-{i}", "name": f"Direction {i}",
+                               "course": i % 4 + 1, "student_count": rnd.randint(10, 200), "university_id": u})
+            kafedras.append({"id": len(kafedras) + 1, "name": f"Kafedra {i}", "university_id": u})
+        for i in range(scale * 5):
+            subject_id = len(subjects) + 1
+            subjects.append({"id": subject_id, "name": f"Subject {i}", "university_id": u,
+                             "kafedra_id": (u - 1) * scale + i % scale + 1})
+            for d in rnd.sample(range(1, scale + 1), 3):
+                links.append({"subject_id": subject_id, "direction_id": (u - 1) * scale + d})
+            for _ in range(3):
+                literature.append({"title": "Book", "kind": "textbook", "language": "uzbek", "font_type": "latin",
+                                   "year": 2020, "printed_count": rnd.randint(0, 50), "condition": "actual",
+                                   "usage_status": "use", "subject_id": subject_id, "university_id": u})
+        for i in range(scale * 5):
+            news_id = len(news) + 1
+            news.append({"id": news_id, "title": f"News {i}", "description": "text", "university_id": u,
+                         "date": now - timedelta(hours=news_id)})
+            for t in rnd.sample(range(1, scale + 1), 2):
+                tags.append({"news_id": news_id, "tag_id": t})
+
+    for model, rows in ((Direction, directions), (Kafedra, kafedras), (Subject, subjects),
+                        (subject_directions, links), (Literature, literature), (News, news), (news_tags, tags)):
+        await conn.execute(insert(model), rows)
+    await conn.execute(text("ANALYZE"))
+
+
+def serves_order_limit(query) -> bool:
+    """ORDER BY ... LIMIT: обход индекса в порядке сортировки останавливается после LIMIT строк."""
+    return bool(query._order_by_clauses) and query._limit_clause is not None
+
+
+def full_scans(dialect: str, plan: list[str], order_limit: bool = False) -> list[str]:
+    """Строки плана с полным проходом таблицы или индекса. Обход индекса без условия допустим только
+    под ORDER BY ... LIMIT, когда он и даёт порядок (в плане нет отдельной сортировки)."""
+    if dialect == "postgresql":
+        sorted_separately = any(line.lstrip(" ->").startswith(("Sort", "Incremental Sort")) for line in plan)
+        scans = []
+        for i, line in enumerate(plan):
+            node = line.lstrip(" ->")
+            if node.startswith("Seq Scan"):
+                scans.append(line)
+            elif node.startswith(("Index Scan", "Index Only Scan")):
+                # условия узла — следующие строки без "->" до следующего узла
+                details = []
+                for detail in plan[i + 1:]:
+                    if "->" in detail:
+                        break
+                    details.append(detail.strip())
+                has_cond = any(detail.startswith("Index Cond:") for detail in details)
+                if not has_cond and not (order_limit and not sorted_separately):
+                    scans.append(line)
+        return scans
+    # SQLite: SEARCH — поиск по ключу; SCAN — полный проход, в т.ч. "SCAN t USING [COVERING] INDEX"
+    sorted_separately = any("USE TEMP B-TREE FOR" in line and "ORDER BY" in line for line in plan)
+    return [
+        line for line in plan
+        if line.lstrip().startswith("SCAN")
+        and not (order_limit and not sorted_separately and "USING" in line and "INDEX" in line)
+    ]
+
+
+async def explain_hot_queries(conn) -> dict:
+    """{имя запроса: (строки плана, строки с полным проходом)} на уже засеянной БД."""
+    dialect = conn.dialect.name
+    if dialect == "postgresql":
+        # на маленьком наборе планировщик и так выберет seq scan; запрещаем его,
+        # чтобы seq scan в плане значил «подходящего индекса нет»
+        await conn.execute(text("SET enable_seqscan = off"))
+    prefix = "EXPLAIN" if dialect == "postgresql" else "EXPLAIN QUERY PLAN"
+
+    plans = {}
+    for name, query in hot_queries().items():
+        sql = str(query.compile(conn.sync_engine, compile_kwargs={"literal_binds": True}))
+        rows = (await conn.execute(text(f"{prefix} {sql}"))).all()
+        plan = [str(row[0]) if dialect == "postgresql" else str(row[-1]) for row in rows]
+        plans[name] = (plan, full_scans(dialect, plan, serves_order_limit(query)))
+    return plans
+
+
+async def check(url: str) -> int:
+    engine = create_async_engine(url)
+    failures = 0
+    async with engine.connect() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await seed(conn)
+        for name, (plan, scans) in (await explain_hot_queries(conn)).items():
+            failures += bool(scans)
+            print(f"{'FULL SCAN' if scans else 'ok':<10} {name}")
+            for line in plan:
+                print(f"           {line}")
+        await conn.rollback()
+    await engine.dispose()
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fail if hot router queries fall back to full table scans")
+    parser.add_argument("--url", default="sqlite+aiosqlite://", help="empty database to seed and explain against")
+    args = parser.parse_args()
+    failures = asyncio.run(check(args.url))
+    if failures:
+        print(f"{failures} hot queries fall back to full scans")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.db.slow_queries import slow_query_log
+
+logger = logging.getLogger("app.db")
+
+# Списки параметров "(?, ?, ?)" / "($1, $2)" схлопываем: IN на 3 и на 30 id — один и тот же запрос
+_PARAM_LIST = re.compile(r"\(\s*(?:\?|\$\d+|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|\$\d+|%\(\w+\)s|:\w+))+\s*\)")
+_SPACES = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    return _PARAM_LIST.sub("(...)", _SPACES.sub(" ", statement).strip())
+
+
+class QueryStats:
+    """Статистика SQL за запрос. parent — внешняя статистика (например, query_budget в тесте)."""
+
+    __slots__ = ("count", "total_ms", "fingerprints", "parent", "scope")
+
+    def __init__(self, parent: "QueryStats | None" = None, scope: dict | None = None):
+        self.scope = scope
+        self.count = 0
+        self.total_ms = 0.0
+        self.fingerprints: Counter = Counter()
+        self.parent = parent
+
+    @property
+    def route(self) -> str | None:
+        """Шаблон маршрута текущего HTTP-запроса (роутер кладёт его в scope)."""
+        if self.scope is None:
+            return self.parent.route if self.parent else None
+        route = self.scope.get("route")
+        return f"{self.scope['method']} {getattr(route, 'path', self.scope['path'])}"
+
+    def record(self, key: str, elapsed_ms: float) -> None:
+        stats = self
+        while stats is not None:
+            stats.count += 1
+            stats.total_ms += elapsed_ms
+            stats.fingerprints[key] += 1
+            stats = stats.parent
+
+    def repeated(self, threshold: int = 2) -> dict[str, int]:
+        """Одинаковые запросы, выполненные threshold+ раз — типичный признак N+1."""
+        return {sql: n for sql, n in self.fingerprints.most_common() if n >= threshold}
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> QueryStats | None:
+    return _current_stats.get()
+
+
+def instrument_engine(engine: AsyncEngine, slow_query_ms: float = 0) -> None:
+    """Замер каждого statement: счётчики текущего запроса + журнал медленных запросов."""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context.query_start = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - context.query_start) * 1000
+        key = fingerprint(statement)
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.record(key, elapsed_ms)
+        if (slow_query_ms and elapsed_ms >= slow_query_ms
+                and context.execution_options.get("slow_query_log", True)):
+            slow_query_log.capture(
+                engine, statement, parameters, executemany, elapsed_ms,
+                stats.route if stats is not None else None, key,
+            )
+
+
+class QueryStatsMiddleware:
+    """Считает SQL на каждый HTTP-запрос; в DEBUG отдаёт это в заголовках X-DB-*."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(parent=_current_stats.get(), scope=scope)
+        token = _current_stats.set(stats)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and settings.DEBUG:
+                repeated = stats.repeated(settings.N_PLUS_ONE_THRESHOLD)
+                headers = [
+                    *message.get("headers", []),
+                    (b"x-db-query-count", str(stats.count).encode()),
+                    (b"x-db-time-ms", f"{stats.total_ms:.1f}".encode()),
+                    (b"x-db-repeated", str(max(repeated.values(), default=0)).encode()),
+                ]
+                message = {**message, "headers": headers}
+                if repeated:
+                    logger.warning(
+                        "Possible N+1 in %s %s: %s", scope["method"], scope["path"],
+                        "; ".join(f"{n}x {sql[:120]}" for sql, n in repeated.items()),
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_stats.reset(token)
+
+
+@contextmanager
+def query_budget(max_queries: int, max_repeats: int | None = None):
+    """Хелпер для pytest: все SQL внутри блока (в т.ч. через ASGI-клиент) укладываются в бюджет.
+
+        with query_budget(3):
+            await client.get("/subjects/")
+    """
+    stats = QueryStats(parent=_current_stats.get())
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+    problems = []
+    if stats.count > max_queries:
+        problems.append(f"{stats.count} queries executed, budget is {max_queries}")
+    if max_repeats is not None:
+        repeated = stats.repeated(max_repeats + 1)
+        if repeated:
+            problems.append("repeated statements: " + "; ".join(f"{n}x {sql}" for sql, n in repeated.items()))
+    if problems:
+        details = "\n".join(f"  {n}x {sql}" for sql, n in stats.fingerprints.most_common())
+        raise AssertionError("\n".join(problems) + "\nstatements:\n" + details)
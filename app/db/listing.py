@@ -0,0 +1,72 @@
+from fastapi import HTTPException, Response
+from sqlalchemy import and_, func, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.sql.visitors import InternalTraversal
+from sqlalchemy.types import NullType
+
+# больше любого символа после префикса: верхняя граница диапазона строк, начинающихся с него
+_PREFIX_UPPER = "\U0010ffff"
+
+
+# ======================
+# Списки с поиском по префиксу и keyset-пагинацией по id
+# ======================
+class prefix_like(ColumnElement):
+    """expr LIKE 'q%' в виде, который индекс по expr может обслужить на обоих backend'ах:
+    PostgreSQL сам выводит из LIKE границы для индекса text_pattern_ops, а SQLite выводит их
+    только для колонки с NOCASE (не для lower(col)) — ему добавляется явный диапазон
+    expr >= 'q' AND expr < 'q' || U+10FFFF. На PostgreSQL диапазон не пишется: его < сравнивает
+    по collation базы и мог бы отбросить строки, которые LIKE находит."""
+
+    type = NullType()  # с Boolean SQLite (без native boolean) дописал бы "= 1" в WHERE
+    inherit_cache = True
+    _traverse_internals = [
+        ("like", InternalTraversal.dp_clauseelement),
+        ("range", InternalTraversal.dp_clauseelement),
+    ]
+
+    def __init__(self, expr, prefix: str):
+        escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        self.like = expr.like(escaped + "%", escape="\\")
+        self.range = and_(expr >= prefix, expr < prefix + _PREFIX_UPPER)
+
+
+@compiles(prefix_like)
+def _prefix_like_default(element, compiler, **kw):
+    return "(%s)" % compiler.process(and_(element.range, element.like), **kw)
+
+
+@compiles(prefix_like, "postgresql")
+def _prefix_like_postgresql(element, compiler, **kw):
+    return compiler.process(element.like, **kw)
+
+
+def prefix_match(q: str, *columns):
+    """lower(col) LIKE 'q%' по любой из колонок. Индексы — lower(col), под PostgreSQL
+    с text_pattern_ops (LIKE по префиксу с обычной collation иначе их не использует)."""
+    prefix = q.strip().lower()
+    return or_(*(prefix_like(func.lower(column), prefix) for column in columns))
+
+
+def parse_cursor(cursor: str | None) -> int | None:
+    if cursor is None:
+        return None
+    try:
+        return int(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+async def keyset_page(db: AsyncSession, query, id_column, cursor: str | None, limit: int, response: Response) -> list:
+    """Страница по возрастанию id; id последней строки — в X-Next-Cursor, если есть следующая."""
+    after = parse_cursor(cursor)
+    if after is not None:
+        query = query.where(id_column > after)
+    result = await db.execute(query.order_by(id_column).limit(limit + 1))
+    items = result.scalars().all()
+    if len(items) > limit:
+        items = items[:limit]
+        response.headers["X-Next-Cursor"] = str(items[-1].id)
+    return items
@@ -0,0 +1,145 @@
+import asyncio
+from functools import partial
+
+from fastapi import Depends
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.db.session import get_read_db
+from app.models.direction import Direction
+from app.models.subject import Subject, subject_directions
+from app.models.tag import Tag, news_tags
+
+# Один IN-запрос на пачку; больше — режем, чтобы не упереться в лимит параметров драйвера
+MAX_BATCH = 1000
+
+
+class BatchLoader:
+    """Копит ключи, запрошенные за один тик event loop, и грузит их одним IN-запросом.
+    Результаты кэшируются на время жизни загрузчика (т.е. на HTTP-запрос)."""
+
+    def __init__(self, batch_fn, lock: asyncio.Lock, default=None):
+        self._batch_fn = batch_fn  # async (keys) -> {key: value}
+        self._lock = lock  # AsyncSession не допускает параллельных запросов
+        self._default = default
+        self._futures: dict = {}
+        self._queue: list = []
+        self._task: asyncio.Task | None = None
+
+    def load(self, key) -> asyncio.Future:
+        future = self._futures.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._futures[key] = loop.create_future()
+            self._queue.append(key)
+            if len(self._queue) == 1:
+                # ждём один тик: ключи из соседних load() (gather) попадут в ту же пачку
+                loop.call_soon(self._schedule)
+        return future
+
+    async def load_many(self, keys) -> list:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def _schedule(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._dispatch())
+
+    async def _dispatch(self) -> None:
+        keys, self._queue = self._queue, []
+        try:
+            values: dict = {}
+            async with self._lock:
+                for i in range(0, len(keys), MAX_BATCH):
+                    values.update(await self._batch_fn(keys[i:i + MAX_BATCH]))
+        except Exception as exc:
+            for key in keys:
+                self._futures.pop(key).set_exception(exc)
+            return
+        for key in keys:
+            value = values.get(key)
+            if value is None and self._default is not None:
+                value = self._default()
+            self._futures[key].set_result(value)
+
+
+class RelationshipLoader(BatchLoader):
+    """BatchLoader для relationship: attach() заполняет атрибут без lazy load."""
+
+    def __init__(self, batch_fn, lock, attr: str, key_attr: str = "id", default=None):
+        super().__init__(batch_fn, lock, default)
+        self.attr = attr
+        self.key_attr = key_attr
+
+    async def attach(self, instances: list) -> list:
+        values = await self.load_many([getattr(obj, self.key_attr) for obj in instances])
+        for obj, value in zip(instances, values):
+            set_committed_value(obj, self.attr, value)
+        return instances
+
+
+# ---- Пакетные запросы: ключи -> {ключ: значение} ----
+async def _subject_directions(db: AsyncSession, subject_ids: list) -> dict:
+    rows = await db.execute(
+        select(subject_directions.c.subject_id, Direction)
+        .join(Direction, Direction.id == subject_directions.c.direction_id)
+        .where(subject_directions.c.subject_id.in_(subject_ids))
+        .order_by(Direction.id)
+    )
+    grouped: dict = {}
+    for subject_id, direction in rows:
+        grouped.setdefault(subject_id, []).append(direction)
+    return grouped
+
+
+async def _direction_subjects(db: AsyncSession, direction_ids: list) -> dict:
+    rows = await db.execute(
+        select(subject_directions.c.direction_id, Subject)
+        .join(Subject, Subject.id == subject_directions.c.subject_id)
+        .where(subject_directions.c.direction_id.in_(direction_ids))
+        .order_by(Subject.id)
+    )
+    grouped: dict = {}
+    for direction_id, subject in rows:
+        grouped.setdefault(direction_id, []).append(subject)
+    return grouped
+
+
+def news_tags_query(news_ids: list):
+    return (
+        select(news_tags.c.news_id, Tag)
+        .join(Tag, Tag.id == news_tags.c.tag_id)
+        .where(news_tags.c.news_id.in_(news_ids))
+        .order_by(Tag.name)
+    )
+
+
+async def _news_tags(db: AsyncSession, news_ids: list) -> dict:
+    rows = await db.execute(news_tags_query(news_ids))
+    grouped: dict = {}
+    for news_id, tag in rows:
+        grouped.setdefault(news_id, []).append(tag)
+    return grouped
+
+
+async def _subjects_by_id(db: AsyncSession, subject_ids: list) -> dict:
+    result = await db.execute(select(Subject).where(Subject.id.in_(subject_ids)))
+    return {s.id: s for s in result.scalars()}
+
+
+class Loaders:
+    """Загрузчики частых relationship в рамках одной сессии/запроса:
+
+        await loaders.subject_directions.attach(subjects)  # Subject.directions, один запрос
+        tags = await loaders.news_tags.load(news_id)
+    """
+
+    def __init__(self, db: AsyncSession):
+        lock = asyncio.Lock()
+        self.subject_directions = RelationshipLoader(partial(_subject_directions, db), lock, "directions", default=list)
+        self.direction_subjects = RelationshipLoader(partial(_direction_subjects, db), lock, "subjects", default=list)
+        self.news_tags = RelationshipLoader(partial(_news_tags, db), lock, "tags", default=list)
+        self.literature_subject = RelationshipLoader(partial(_subjects_by_id, db), lock, "subject", key_attr="subject_id")
+
+
+def get_loaders(db: AsyncSession = Depends(get_read_db)) -> Loaders:
+    return Loaders(db)
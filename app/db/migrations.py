@@ -0,0 +1,49 @@
+from pathlib import Path
+
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+# Последняя ревизия, которой соответствует схема из прежнего create_all при старте.
+# Такие БД (и test.db) без alembic_version: stamp на неё, затем upgrade head —
+# stamp сразу на head пропустил бы индексы и таблицы более поздних миграций. Ревизии после неё
+# проверяют, что уже есть, и доделывают только недостающее; пустую БД собирает `alembic upgrade head`
+# (tests/test_migrations.py проверяет оба пути).
+LEGACY_CREATE_ALL_REVISION = "35dc13600de8"
+
+
+def expected_revision() -> str:
+    """Head-ревизия из alembic/versions (без обращения к БД)."""
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    return ScriptDirectory.from_config(Config(str(ALEMBIC_INI))).get_current_head()
+
+
+async def check_schema_revision(engine: AsyncEngine) -> None:
+    """Один SELECT из alembic_version; при расхождении — падаем сразу, а не на первом запросе."""
+    head = expected_revision()
+    async with engine.connect() as conn:
+        try:
+            current = (await conn.execute(text("SELECT version_num FROM alembic_version"))).scalars().all()
+        except DBAPIError:
+            current = []
+    if current == [head]:
+        return
+    if current:
+        hint = "Run `alembic upgrade head`."
+    elif await _has_tables(engine):
+        hint = (
+            f"Tables exist but are not tracked by Alembic (created by create_all): run "
+            f"`alembic stamp {LEGACY_CREATE_ALL_REVISION}` and then `alembic upgrade head`."
+        )
+    else:
+        hint = "Fresh database: run `alembic upgrade head` to create the schema."
+    raise RuntimeError(f"Database schema revision is {current or 'missing'}, code expects {head}. {hint}")
+
+
+async def _has_tables(engine: AsyncEngine) -> bool:
+    async with engine.connect() as conn:
+        return bool(await conn.run_sync(lambda sync_conn: inspect(sync_conn).get_table_names()))
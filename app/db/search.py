@@ -0,0 +1,80 @@
+from sqlalchemy import column, delete, func, insert, literal_column, select, table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.news import NEWS_FTS_TABLE, NEWS_SEARCH_CONFIG, News
+
+# ======================
+# Полнотекстовый поиск по новостям
+#   PostgreSQL — GIN-индекс по выражению to_tsvector(title || description): синхронизировать нечего
+#   SQLite     — FTS5-таблица news_fts (rowid = news.id), её ведёт роутер новостей
+# ======================
+news_fts = table(NEWS_FTS_TABLE, column("rowid"), column("title"), column("description"))
+
+
+def _tsvector():
+    # константы — литералами: должно совпасть с NEWS_TSVECTOR_SQL (выражение индекса ix_news_fts)
+    empty = literal_column("''")
+    document = func.coalesce(News.title, empty) + literal_column("' '") + func.coalesce(News.description, empty)
+    return func.to_tsvector(literal_column(f"'{NEWS_SEARCH_CONFIG}'"), document)
+
+
+def _dialect(db: AsyncSession) -> str:
+    return db.get_bind().dialect.name
+
+
+def _fts5_query(q: str) -> str:
+    """Пользовательский ввод -> запрос FTS5: каждое слово в кавычках (AND), последнее — префиксом."""
+    words = ['"' + w.replace('"', '""') + '"' for w in q.split()]
+    if words:
+        words[-1] += "*"
+    return " ".join(words)
+
+
+# ---- Синхронизация индекса (до commit, в той же транзакции) ----
+async def index_news(db: AsyncSession, news: News) -> None:
+    if _dialect(db) != "sqlite":
+        return
+    await db.execute(delete(news_fts).where(news_fts.c.rowid == news.id))
+    await db.execute(insert(news_fts).values(rowid=news.id, title=news.title, description=news.description))
+
+
+async def unindex_news(db: AsyncSession, news_id: int) -> None:
+    if _dialect(db) == "sqlite":
+        await db.execute(delete(news_fts).where(news_fts.c.rowid == news_id))
+
+
+async def unindex_university(db: AsyncSession, university_id: int) -> None:
+    """Перед каскадным удалением университета: его новости уходят из news_fts той же транзакцией."""
+    if _dialect(db) == "sqlite":
+        await db.execute(delete(news_fts).where(
+            news_fts.c.rowid.in_(select(News.id).where(News.university_id == university_id))
+        ))
+
+
+def rebuild_statements(dialect: str) -> list:
+    """Пересборка индекса SQLite по таблице news (после загрузки данных в обход API)."""
+    if dialect != "sqlite":
+        return []
+    return [
+        delete(news_fts),
+        text(f"INSERT INTO {NEWS_FTS_TABLE} (rowid, title, description) SELECT id, title, description FROM news"),
+    ]
+
+
+# ---- Поиск ----
+def search_query(db: AsyncSession, q: str):
+    """select(News, score): чем меньше score, тем релевантнее (на обоих диалектах)."""
+    if _dialect(db) == "postgresql":
+        tsquery = func.websearch_to_tsquery(literal_column(f"'{NEWS_SEARCH_CONFIG}'"), q)
+        score = (-func.ts_rank(_tsvector(), tsquery)).label("score")
+        return select(News, score).where(_tsvector().op("@@")(tsquery)), score
+
+    # bm25() в FTS5 уже «меньше — лучше»
+    score = func.bm25(literal_column(NEWS_FTS_TABLE)).label("score")
+    query = (
+        select(News, score)
+        .select_from(news_fts)
+        .join(News, News.id == news_fts.c.rowid)
+        .where(literal_column(NEWS_FTS_TABLE).op("MATCH")(_fts5_query(q)))
+    )
+    return query, score
@@ -0,0 +1,119 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, asdict
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.db")
+
+
+@dataclass
+class SlowQuery:
+    at: datetime
+    duration_ms: float
+    statement: str
+    parameter_shapes: object
+    route: str | None
+    plan: list[str] | None = None
+    explain_error: str | None = None
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def parameter_shapes(parameters, executemany: bool = False):
+    """Типы параметров вместо значений: в лог не должны попадать email'ы/пароли."""
+    if executemany:
+        rows = list(parameters or [])
+        return {"rows": len(rows), "row": parameter_shapes(rows[0]) if rows else None}
+    if isinstance(parameters, dict):
+        return {k: type(v).__name__ for k, v in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(v).__name__ for v in parameters]
+    return type(parameters).__name__
+
+
+class SlowQueryLog:
+    """Кольцевой буфер медленных запросов; EXPLAIN снимается в фоне отдельным соединением."""
+
+    def __init__(self, maxlen: int):
+        self._records: deque[SlowQuery] = deque(maxlen=maxlen)
+        # отпечаток -> время последнего EXPLAIN, по возрастанию времени; размер — как у буфера
+        self._explained_at: "OrderedDict[str, float]" = OrderedDict()
+        self._max_fingerprints = maxlen
+        self._explaining = False
+        self._explain_task: asyncio.Task | None = None
+
+    def records(self) -> list[SlowQuery]:
+        return list(reversed(self._records))
+
+    def clear(self) -> None:
+        self._records.clear()
+        self._explained_at.clear()
+
+    def capture(self, engine: AsyncEngine, statement: str, parameters, executemany: bool,
+                elapsed_ms: float, route: str | None, fingerprint: str) -> None:
+        record = SlowQuery(
+            at=datetime.utcnow(),
+            duration_ms=round(elapsed_ms, 2),
+            statement=statement,
+            parameter_shapes=parameter_shapes(parameters, executemany),
+            route=route,
+        )
+        self._records.append(record)
+        logger.warning("Slow query (%.1f ms) in %s: %s", elapsed_ms, route, statement)
+
+        # EXPLAIN (ANALYZE) повторно выполняет запрос — не чаще раза в минуту на отпечаток
+        # и не больше одного одновременно, чтобы не добавить нагрузки медленной БД
+        now = time.monotonic()
+        if (not settings.SLOW_QUERY_EXPLAIN or executemany or self._explaining
+                or now - self._explained_at.get(fingerprint, -60.0) < 60):
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._explaining = True
+        self._remember_explain(fingerprint, now)
+        self._explain_task = loop.create_task(self._explain(engine, record, statement, parameters))
+
+    def _remember_explain(self, fingerprint: str, now: float) -> None:
+        self._explained_at[fingerprint] = now
+        self._explained_at.move_to_end(fingerprint)
+        # старше минуты — уже не ограничивают; сверх лимита — вытесняем самые старые
+        while self._explained_at and (
+            len(self._explained_at) > self._max_fingerprints
+            or now - next(iter(self._explained_at.values())) >= 60
+        ):
+            self._explained_at.popitem(last=False)
+
+    async def _explain(self, engine: AsyncEngine, record: SlowQuery, statement: str, parameters) -> None:
+        dialect = engine.dialect.name
+        # WITH не проверяем: в CTE может быть INSERT/UPDATE/DELETE
+        is_select = statement.lstrip().upper().startswith("SELECT")
+        if dialect == "postgresql":
+            # ANALYZE реально выполняет запрос, поэтому только для простого SELECT
+            prefix = "EXPLAIN (ANALYZE, BUFFERS)" if is_select and settings.SLOW_QUERY_EXPLAIN_ANALYZE else "EXPLAIN"
+        elif dialect == "sqlite":
+            prefix = "EXPLAIN QUERY PLAN"
+        else:
+            prefix = "EXPLAIN"
+        try:
+            async with engine.connect() as conn:
+                conn = await conn.execution_options(slow_query_log=False)
+                result = await conn.exec_driver_sql(f"{prefix} {statement}", parameters or ())
+                rows = result.all()
+                record.plan = [str(row[0]) if dialect == "postgresql" else " | ".join(map(str, row)) for row in rows]
+                await conn.rollback()
+        except Exception as exc:
+            record.explain_error = f"{type(exc).__name__}: {exc}"
+        finally:
+            self._explaining = False
+
+
+slow_query_log = SlowQueryLog(settings.SLOW_QUERY_LOG_SIZE)
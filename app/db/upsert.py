@@ -0,0 +1,32 @@
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# INSERT ... ON CONFLICT есть только в диалектных insert()
+_inserts = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def _dialect_insert(db: AsyncSession, table):
+    dialect = db.get_bind().dialect.name
+    try:
+        return _inserts[dialect](table)
+    except KeyError:
+        raise RuntimeError(f"ON CONFLICT is not supported for dialect: {dialect}")
+
+
+def insert_ignore(db: AsyncSession, table, index_elements: list):
+    """INSERT ... ON CONFLICT (index_elements) DO NOTHING для диалекта сессии.
+    Строки, упёршиеся в конфликт, в RETURNING не попадают."""
+    return _dialect_insert(db, table).on_conflict_do_nothing(index_elements=index_elements)
+
+
+def insert_or_add(db: AsyncSession, table, index_elements: list, column: str):
+    """INSERT ... ON CONFLICT (index_elements) DO UPDATE SET column = column + excluded.column —
+    счётчик, который создаётся первой вставкой и дальше только прибавляется."""
+    stmt = _dialect_insert(db, table)
+    return stmt.on_conflict_do_update(
+        index_elements=index_elements,
+        set_={column: table.c[column] + stmt.excluded[column]},
+    )
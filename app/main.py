@@ -1,17 +1,32 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.db.session import Base, engine
-from app.routers import auth, university, user, direction, kafedra, subject, literature, stats, general_stats, statistics, admin, news
+from app.core.config import settings
+from app.db.session import Base, engine, ReadYourWritesMiddleware
+from app.db.migrations import check_schema_revision
+from app.db.instrumentation import QueryStatsMiddleware
+from app.core.metrics import MetricsMiddleware
+from app.utils.response_cache import ResponseCacheMiddleware
+from app.utils.compression import CompressionMiddleware
+from app.utils.images import image_pipeline
+from app.routers import auth, university, user, direction, kafedra, subject, literature, stats, general_stats, statistics, admin, news, metrics, diagnostics, events
 app = FastAPI()
 
-# ===================== CORS =====================
+# ===================== Middleware =====================
+app.add_middleware(ResponseCacheMiddleware)
+app.add_middleware(CompressionMiddleware)  # снаружи кэша: в кэше лежат несжатые тела
+app.add_middleware(ReadYourWritesMiddleware)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(QueryStatsMiddleware)  # снаружи MetricsMiddleware: статистика SQL видна ей до сброса
 
+# ===================== CORS =====================
+# Регистрируется последним — самый внешний: ответы из кэша (HIT и 304) тоже получают CORS-заголовки
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://127.0.0.1:5173"],  # frontend
     allow_credentials=True,  # 🔹 обязательно
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-DB-Query-Count", "X-DB-Time-Ms", "X-DB-Repeated", "ETag", "X-Cache", "X-Next-Cursor"],
 )
 
 # ===================== Routers =====================
@@ -27,11 +42,23 @@ app.include_router(stats.router)
 app.include_router(statistics.router)
 app.include_router(general_stats.router)
 app.include_router(news.router)
+app.include_router(metrics.router)
+app.include_router(diagnostics.router)
+app.include_router(events.router)
 
 
 # ===================== Startup =====================
 @app.on_event("startup")
 async def startup():
-    # Создание всех таблиц асинхронно
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    # Схемой управляет Alembic; при старте только сверяем ревизию
+    if settings.SCHEMA_STARTUP_MODE == "check":
+        await check_schema_revision(engine)
+    elif settings.SCHEMA_STARTUP_MODE == "create_all":
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    image_pipeline.start_backfill()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await image_pipeline.close(settings.NEWS_IMAGE_SHUTDOWN_TIMEOUT)
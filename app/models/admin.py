@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, Index, func
 from sqlalchemy.orm import relationship
 from app.db.session import Base
 
@@ -11,4 +11,10 @@ class Admin(Base):
     role = Column(String, nullable=False)  # "superadmin" | "owner"
     university_id = Column(Integer, ForeignKey("universities.id"), nullable=True)
 
-    university = relationship("University", back_populates="admins")
\ No newline at end of file
+    university = relationship("University", back_populates="admins")
+
+    __table_args__ = (
+        Index("ix_admins_university_id_id", university_id, id),
+        Index("ix_admins_lower_email", func.lower(email).label("lower_email"),
+              postgresql_ops={"lower_email": "text_pattern_ops"}),
+    )
@@ -12,7 +12,7 @@ class Direction(Base):
     course = Column(Integer, nullable=False)
     student_count = Column(Integer, nullable=False)
 
-    university_id = Column(Integer, ForeignKey("universities.id", ondelete="CASCADE"))
+    university_id = Column(Integer, ForeignKey("universities.id", ondelete="CASCADE"), index=True)
     university = relationship("University", back_populates="directions")
 
     subjects = relationship(
@@ -9,7 +9,7 @@ class Kafedra(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
 
-    university_id = Column(Integer, ForeignKey("universities.id", ondelete="CASCADE"))
+    university_id = Column(Integer, ForeignKey("universities.id", ondelete="CASCADE"), index=True)
     university = relationship("University", back_populates="kafedras")
 
     subjects = relationship("Subject", back_populates="kafedra", cascade="all, delete-orphan")
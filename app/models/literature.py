@@ -41,7 +41,7 @@ class Literature(Base):
     image = Column(String, nullable=True)
     file_path = Column(String, nullable=True)
 
-    subject_id = Column(Integer, ForeignKey("subjects.id", ondelete="CASCADE"))
+    subject_id = Column(Integer, ForeignKey("subjects.id", ondelete="CASCADE"), index=True)
     subject = relationship("Subject", back_populates="literature")
 
-    university_id = Column(Integer, ForeignKey("universities.id"))
\ No newline at end of file
+    university_id = Column(Integer, ForeignKey("universities.id"), index=True)
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, JSON, DDL, event
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.models.tag import news_tags
@@ -10,11 +10,37 @@ class News(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     img = Column(String, nullable=True)  # путь к картинке (опционально)
+    # уменьшенные копии [{path, format, width, bytes}] — заполняет фоновая обработка
+    img_variants = Column(JSON, nullable=True)
     title = Column(String, nullable=False)
     description = Column(Text, nullable=False)
-    date = Column(DateTime, default=datetime.utcnow)  # дата публикации
+    date = Column(DateTime, default=datetime.utcnow, index=True)  # дата публикации
 
-    university_id = Column(Integer, ForeignKey("universities.id", ondelete="CASCADE"), nullable=False)
+    university_id = Column(Integer, ForeignKey("universities.id", ondelete="CASCADE"), nullable=False, index=True)
 
     university = relationship("University", back_populates="news")
     tags = relationship("Tag", secondary=news_tags, back_populates="news")
+
+    # лента университета: WHERE university_id = ? ORDER BY date DESC, id DESC (keyset)
+    __table_args__ = (
+        Index("ix_news_university_id_date", university_id, date.desc(), id.desc()),
+    )
+
+
+# ---- Полнотекстовый поиск (app/db/search.py) ----
+# Конфигурация и выражение — константы, а не настройки: миграция e5a7c9d3f146 создаёт индекс
+# по копии этого текста, и запрос совпадает с индексом, только пока совпадает выражение —
+# менять его можно только вместе с новой ревизией
+NEWS_SEARCH_CONFIG = "simple"  # тексты на нескольких языках — без стемминга
+NEWS_TSVECTOR_SQL = f"to_tsvector('{NEWS_SEARCH_CONFIG}', coalesce(title, '') || ' ' || coalesce(description, ''))"
+NEWS_FTS_INDEX = "ix_news_fts"
+NEWS_FTS_TABLE = "news_fts"  # SQLite FTS5 (+ служебные news_fts_*)
+
+NEWS_FTS_POSTGRESQL_DDL = f"CREATE INDEX IF NOT EXISTS {NEWS_FTS_INDEX} ON news USING gin ({NEWS_TSVECTOR_SQL})"
+NEWS_FTS_SQLITE_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {NEWS_FTS_TABLE} "
+    "USING fts5(title, description, tokenize='unicode61 remove_diacritics 2')"
+)
+
+event.listen(News.__table__, "after_create", DDL(NEWS_FTS_POSTGRESQL_DDL).execute_if(dialect="postgresql"))
+event.listen(News.__table__, "after_create", DDL(NEWS_FTS_SQLITE_DDL).execute_if(dialect="sqlite"))
@@ -9,7 +9,7 @@ subject_directions = Table(
     "subject_directions",
     Base.metadata,
     Column("subject_id", Integer, ForeignKey("subjects.id", ondelete="CASCADE"), primary_key=True),
-    Column("direction_id", Integer, ForeignKey("directions.id", ondelete="CASCADE"), primary_key=True),
+    Column("direction_id", Integer, ForeignKey("directions.id", ondelete="CASCADE"), primary_key=True, index=True),
 )
 
 # ======================
@@ -21,8 +21,8 @@ class Subject(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
 
-    kafedra_id = Column(Integer, ForeignKey("kafedras.id", ondelete="CASCADE"), nullable=False)
-    university_id = Column(Integer, ForeignKey("universities.id", ondelete="CASCADE"), nullable=False)
+    kafedra_id = Column(Integer, ForeignKey("kafedras.id", ondelete="CASCADE"), nullable=False, index=True)
+    university_id = Column(Integer, ForeignKey("universities.id", ondelete="CASCADE"), nullable=False, index=True)
 
     # --- Relationships ---
     kafedra = relationship("Kafedra", back_populates="subjects")
@@ -1,4 +1,4 @@
-from sqlalchemy import Table, Column, Integer, String, ForeignKey
+from sqlalchemy import Table, Column, Integer, String, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.db.session import Base
 
@@ -6,8 +6,8 @@ from app.db.session import Base
 news_tags = Table(
     "news_tags",
     Base.metadata,
-    Column("news_id", Integer, ForeignKey("news.id", ondelete="CASCADE")),
-    Column("tag_id", Integer, ForeignKey("tags.id", ondelete="CASCADE")),
+    Column("news_id", Integer, ForeignKey("news.id", ondelete="CASCADE"), primary_key=True),
+    Column("tag_id", Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True, index=True),
 )
 
 class Tag(Base):
@@ -17,3 +17,16 @@ class Tag(Base):
     name = Column(String, unique=True, nullable=False)
 
     news = relationship("News", secondary=news_tags, back_populates="tags")
+
+
+# Счётчики тегов: university_id = 0 — по всем университетам (поэтому без FK).
+# Поддерживаются в той же транзакции, что и изменения news_tags (app/utils/tag_stats.py)
+tag_stats = Table(
+    "tag_stats",
+    Base.metadata,
+    Column("university_id", Integer, primary_key=True),
+    Column("tag_id", Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True),
+    Column("count", Integer, nullable=False),
+    # топ-N университета — чтение первых N записей индекса
+    Index("ix_tag_stats_university_id_count", "university_id", "count"),
+)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, Index, func
 from sqlalchemy.orm import relationship
 from app.db.session import Base
 
@@ -15,3 +15,14 @@ class User(Base):
 
     university_id = Column(Integer, ForeignKey("universities.id"), nullable=True)
     university = relationship("University", backref="users")
+
+    # списки для owner: фильтр по университету + keyset по id, поиск по префиксу email/имени
+    __table_args__ = (
+        Index("ix_users_university_id_id", university_id, id),
+        Index("ix_users_lower_email", func.lower(email).label("lower_email"),
+              postgresql_ops={"lower_email": "text_pattern_ops"}),
+        Index("ix_users_lower_first_name", func.lower(first_name).label("lower_first_name"),
+              postgresql_ops={"lower_first_name": "text_pattern_ops"}),
+        Index("ix_users_lower_last_name", func.lower(last_name).label("lower_last_name"),
+              postgresql_ops={"lower_last_name": "text_pattern_ops"}),
+    )
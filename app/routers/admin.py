@@ -1,6 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from app.core.config import settings
+from app.db.listing import keyset_page, prefix_match
 from app.db.session import get_db
 from app.models.admin import Admin
 from app.schemas.admin import AdminCreate, AdminOut, AdminUpdate
@@ -25,11 +29,25 @@ async def create_admin(admin_in: AdminCreate, db: AsyncSession = Depends(get_db)
     return new_admin
 
 
-# ----------- Получение всех ----------
+# ----------- Получение всех: поиск по префиксу email, фильтры, keyset (?cursor=<X-Next-Cursor>) ----------
 @router.get("/", response_model=list[AdminOut])
-async def get_admins(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Admin))
-    return result.scalars().all()
+async def get_admins(
+    response: Response,
+    q: Optional[str] = Query(None, max_length=100),
+    role: Optional[str] = None,
+    university_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.ACCOUNTS_PAGE_SIZE, ge=1, le=settings.ACCOUNTS_PAGE_MAX),
+    db: AsyncSession = Depends(get_db),
+):
+    query = select(Admin)
+    if q and q.strip():
+        query = query.where(prefix_match(q, Admin.email))
+    if role is not None:
+        query = query.where(Admin.role == role)
+    if university_id is not None:
+        query = query.where(Admin.university_id == university_id)
+    return await keyset_page(db, query, Admin.id, cursor, limit, response)
 
 
 # ----------- Получение по ID ----------
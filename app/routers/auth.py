@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, Response, Cookie
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, Cookie
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.ext.asyncio import AsyncSession
 from jose import jwt, JWTError
 
@@ -7,21 +8,34 @@ from app.schemas.auth import UserRegister, AdminCreate, UserLogin
 from app.models.user import User
 from app.models.admin import Admin
 from app.db.session import get_db
-from app.dependencies import get_user_by_email, require_role
-from app.utils.security import get_password_hash, verify_password, create_access_token, create_refresh_token
+from app.dependencies import get_user_by_email, require_role, require_owner
+from app.utils.security import get_password_hash, verify_and_update_password, create_access_token, create_refresh_token
+from app.utils.rate_limit import RateLimiter, client_ip, limiter_stats
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+# ------------------------------
+# Rate limit: bcrypt дорогой, поэтому лишние попытки режем до БД
+# ------------------------------
+login_ip_limiter = RateLimiter("login_ip", settings.AUTH_IP_BURST, settings.AUTH_IP_PER_MINUTE)
+login_email_limiter = RateLimiter("login_email", settings.AUTH_EMAIL_BURST, settings.AUTH_EMAIL_PER_MINUTE)
+register_ip_limiter = RateLimiter("register_ip", settings.AUTH_IP_BURST, settings.AUTH_IP_PER_MINUTE)
+register_email_limiter = RateLimiter("register_email", settings.AUTH_EMAIL_BURST, settings.AUTH_EMAIL_PER_MINUTE)
+
+
 # ------------------------------
 # Регистрация обычного пользователя
 # ------------------------------
 @router.post("/register", response_model=dict)
-async def register_user(user_data: UserRegister, db: AsyncSession = Depends(get_db)):
+async def register_user(user_data: UserRegister, request: Request, db: AsyncSession = Depends(get_db)):
+    await register_ip_limiter.hit(client_ip(request))
+    await register_email_limiter.hit(user_data.email.lower())
+
     existing_user = await get_user_by_email(db, user_data.email)
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
 
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await run_in_threadpool(get_password_hash, user_data.password)
     new_user = User(
         first_name=user_data.first_name,
         last_name=user_data.last_name,
@@ -39,11 +53,24 @@ async def register_user(user_data: UserRegister, db: AsyncSession = Depends(get_
 # Логин
 # ------------------------------
 @router.post("/login")
-async def login(form_data: UserLogin, response: Response, db: AsyncSession = Depends(get_db)):
+async def login(form_data: UserLogin, request: Request, response: Response, db: AsyncSession = Depends(get_db)):
+    await login_ip_limiter.hit(client_ip(request))
+    await login_email_limiter.hit(form_data.email.lower())
+
     user = await get_user_by_email(db, form_data.email)
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user:
         raise HTTPException(status_code=400, detail="Incorrect email or password")
 
+    # хеш считаем вне event loop; устаревший хеш (другой профиль/cost) пересохраняем
+    verified, new_hash = await run_in_threadpool(
+        verify_and_update_password, form_data.password, user.hashed_password
+    )
+    if not verified:
+        raise HTTPException(status_code=400, detail="Incorrect email or password")
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
+
     role = getattr(user, "role", "user")
     university_id = getattr(user, "university_id", None)
 
@@ -79,6 +106,14 @@ async def login(form_data: UserLogin, response: Response, db: AsyncSession = Dep
         "university_id": university_id
     }
 
+# ------------------------------
+# Заполненность bucket'ов rate limit (owner)
+# ------------------------------
+@router.get("/rate-limits")
+async def rate_limit_stats(current_user=Depends(require_owner)):
+    return await limiter_stats()
+
+
 @router.post("/logout")
 def logout(response: Response):
     response.delete_cookie("refresh_token")  # удаляем refresh_token cookie
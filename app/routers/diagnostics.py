@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Depends, status
+
+from app.db.session import engine, replica_engines, pool_stats
+from app.db.slow_queries import slow_query_log
+from app.dependencies import require_owner
+
+router = APIRouter(prefix="/diagnostics", tags=["diagnostics"])
+
+
+# ---- Медленные запросы (owner) ----
+@router.get("/slow-queries")
+async def get_slow_queries(current_user=Depends(require_owner)):
+    return [record.to_dict() for record in slow_query_log.records()]
+
+
+@router.delete("/slow-queries", status_code=status.HTTP_204_NO_CONTENT)
+async def clear_slow_queries(current_user=Depends(require_owner)):
+    slow_query_log.clear()
+    return None
+
+
+# ---- Состояние пулов соединений (owner) ----
+@router.get("/pool")
+async def get_pool_stats(current_user=Depends(require_owner)):
+    return {
+        "primary": pool_stats(engine),
+        "replicas": [pool_stats(replica) for replica in replica_engines],
+    }
@@ -3,18 +3,23 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
+from app.db.loaders import Loaders, get_loaders
+from app.utils.change_feed import emit_change
 from app.models.direction import Direction
-from app.schemas.direction import DirectionCreate, DirectionUpdate, DirectionOut
+from app.schemas.direction import DirectionCreate, DirectionUpdate, DirectionOut, DirectionWithSubjects
 from app.dependencies import get_current_user
 
 router = APIRouter(prefix="/directions", tags=["directions"])
 
 # ---- Получение списка ----
-@router.get("/", response_model=List[DirectionOut])
-async def get_directions(db: AsyncSession = Depends(get_db)):
+@router.get("/", response_model=List[DirectionWithSubjects])
+async def get_directions(
+    db: AsyncSession = Depends(get_read_db),
+    loaders: Loaders = Depends(get_loaders),
+):
     result = await db.execute(select(Direction))
-    return result.scalars().all()
+    return await loaders.direction_subjects.attach(result.scalars().all())
 
 
 # ---- Создание ---- (owner / superadmin)
@@ -54,6 +59,7 @@ async def create_direction(
     direction = Direction(**data.model_dump())
     db.add(direction)
     await db.commit()
+    await emit_change("directions", direction.id, direction.university_id, "create")
     await db.refresh(direction)
     return direction
 
@@ -78,10 +84,12 @@ async def update_direction(
     if current_user.role not in ("owner", "superadmin"):
         raise HTTPException(status_code=403, detail="Not allowed")
 
+    previous_university_id = direction.university_id
     for field, value in data.model_dump(exclude_unset=True).items():
         setattr(direction, field, value)
 
     await db.commit()
+    await emit_change("directions", direction.id, direction.university_id, "update", previous_university_id)
     await db.refresh(direction)
     return direction
 
@@ -107,4 +115,5 @@ async def delete_direction(
 
     await db.delete(direction)
     await db.commit()
+    await emit_change("directions", direction_id, direction.university_id, "delete")
     return None
@@ -0,0 +1,39 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.session import get_db
+from app.dependencies import require_superadmin
+from app.utils.change_feed import broker, get_change_backend, stream
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+
+# ---- Лента изменений (SSE): {entity, id, university_id, op} после каждого commit ----
+# owner → все университеты или один (?university_id=), superadmin → только свой
+@router.get("/stream")
+async def change_stream(
+    university_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(require_superadmin),
+):
+    if current_user.role == "superadmin":
+        if university_id is not None and university_id != current_user.university_id:
+            raise HTTPException(status_code=403, detail="Not your university")
+        university_id = current_user.university_id
+
+    if broker.count >= settings.CHANGE_FEED_MAX_SUBSCRIBERS:
+        raise HTTPException(status_code=503, detail="Too many change feed subscribers")
+
+    # соединение с БД не должно висеть всё время жизни потока
+    await db.close()
+
+    await get_change_backend().start()
+    return StreamingResponse(
+        stream(university_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
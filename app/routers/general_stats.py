@@ -3,7 +3,7 @@ from fastapi import APIRouter, Depends
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
+from app.db.session import get_read_db
 from app.models.university import University
 from app.models.direction import Direction
 
@@ -11,7 +11,7 @@ router = APIRouter(prefix="/stats", tags=["stats"])
 
 @router.get("/general")
 async def general_stats(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     # Общее количество университетов
     uni_result = await db.execute(
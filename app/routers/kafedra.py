@@ -3,7 +3,8 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
+from app.utils.change_feed import emit_change
 from app.models.kafedra import Kafedra
 from app.schemas.kafedra import KafedraCreate, KafedraUpdate, KafedraOut
 from app.dependencies import get_current_user
@@ -13,7 +14,7 @@ router = APIRouter(prefix="/kafedras", tags=["kafedras"])
 
 # ---- Получение списка ----
 @router.get("/", response_model=List[KafedraOut])
-async def get_kafedras(db: AsyncSession = Depends(get_db)):
+async def get_kafedras(db: AsyncSession = Depends(get_read_db)):
     result = await db.execute(select(Kafedra))
     return result.scalars().all()
 
@@ -39,6 +40,7 @@ async def create_kafedra(
     kafedra = Kafedra(**data.model_dump())
     db.add(kafedra)
     await db.commit()
+    await emit_change("kafedras", kafedra.id, kafedra.university_id, "create")
     await db.refresh(kafedra)
     return kafedra
 
@@ -61,10 +63,12 @@ async def update_kafedra(
     if current_user.role not in ("owner", "superadmin"):
         raise HTTPException(status_code=403, detail="Not allowed")
 
+    previous_university_id = kafedra.university_id
     for field, value in data.model_dump(exclude_unset=True).items():
         setattr(kafedra, field, value)
 
     await db.commit()
+    await emit_change("kafedras", kafedra.id, kafedra.university_id, "update", previous_university_id)
     await db.refresh(kafedra)
     return kafedra
 
@@ -89,5 +93,6 @@ async def delete_kafedra(
 
     await db.delete(kafedra)
     await db.commit()
+    await emit_change("kafedras", kafedra_id, kafedra.university_id, "delete")
     return None
 
@@ -8,18 +8,28 @@ import os
 from fastapi import UploadFile, File, Form
 
 
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
+from app.db.loaders import Loaders, get_loaders
+from app.utils.change_feed import emit_change
 from app.models.literature import Literature
 from app.schemas.enums import FontTypeEnum, LanguageEnum, ConditionEnum, UsageStatusEnum
-from app.schemas.literature import LiteratureCreate, LiteratureUpdate, LiteratureOut
+from app.schemas.literature import LiteratureCreate, LiteratureUpdate, LiteratureOut, LiteratureWithSubject
 from app.dependencies import get_current_user
+from app.core.metrics import UPLOAD_BYTES
 
 router = APIRouter(prefix="/literatures", tags=["literatures"])
 
-@router.get("/", response_model=List[LiteratureOut])
-async def get_literatures(db: AsyncSession = Depends(get_db)):
+@router.get("/", response_model=List[LiteratureWithSubject])
+async def get_literatures(
+    db: AsyncSession = Depends(get_read_db),
+    loaders: Loaders = Depends(get_loaders),
+):
+    # предметы — одним IN-запросом на список, их направления — ещё одним
     result = await db.execute(select(Literature))
-    return result.scalars().all()
+    literature = await loaders.literature_subject.attach(result.scalars().all())
+    subjects = {item.subject.id: item.subject for item in literature if item.subject is not None}
+    await loaders.subject_directions.attach(list(subjects.values()))
+    return literature
 
 # ---- Создание ---- (owner / superadmin)
 @router.post("/", response_model=LiteratureOut)
@@ -41,6 +51,7 @@ async def create_literature(
     literature = Literature(**literature_data)
     db.add(literature)
     await db.commit()
+    await emit_change("literature", literature.id, literature.university_id, "create")
     await db.refresh(literature)
     return literature
 
@@ -64,10 +75,12 @@ async def update_literature(
     if current_user.role not in ("owner", "superadmin"):
         raise HTTPException(status_code=403, detail="Not allowed")
 
+    previous_university_id = literature.university_id
     for field, value in data.model_dump(exclude_unset=True).items():
         setattr(literature, field, value)
 
     await db.commit()
+    await emit_change("literature", literature_id, literature.university_id, "update", previous_university_id)
     await db.refresh(literature)
     return literature
 
@@ -90,6 +103,7 @@ async def delete_literature(
 
     await db.delete(literature)
     await db.commit()
+    await emit_change("literature", literature_id, literature.university_id, "delete")
     return None
 
 
@@ -119,8 +133,10 @@ async def create_literature_with_file(
         os.makedirs(upload_dir, exist_ok=True)
         file_path = os.path.join(upload_dir, file.filename)
 
+        content = await file.read()
         with open(file_path, "wb") as f:
-            f.write(await file.read())
+            f.write(content)
+        UPLOAD_BYTES.inc(len(content), kind="literature")
 
     literature = Literature(
         title=title,
@@ -139,6 +155,7 @@ async def create_literature_with_file(
     )
     db.add(literature)
     await db.commit()
+    await emit_change("literature", literature.id, literature.university_id, "create")
     await db.refresh(literature)
     return literature
 
@@ -146,7 +163,7 @@ async def create_literature_with_file(
 @router.get("/{literature_id}/download")
 async def download_literature_file(
     literature_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user=Depends(get_current_user)
 ):
     literature = await db.get(Literature, literature_id)
@@ -195,12 +212,15 @@ async def update_literature_with_file(
         os.makedirs(upload_dir, exist_ok=True)
         file_path = os.path.join(upload_dir, file.filename)
 
+        content = await file.read()
         with open(file_path, "wb") as f:
-            f.write(await file.read())
+            f.write(content)
+        UPLOAD_BYTES.inc(len(content), kind="literature")
 
         literature.file_path = file_path
 
     # обновляем остальные поля
+    previous_university_id = literature.university_id
     literature.title = title
     literature.kind = kind
     literature.author = author
@@ -215,5 +235,6 @@ async def update_literature_with_file(
     literature.university_id = university_id
 
     await db.commit()
+    await emit_change("literature", literature_id, literature.university_id, "update", previous_university_id)
     await db.refresh(literature)
     return literature
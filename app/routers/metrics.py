@@ -0,0 +1,52 @@
+import time
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core import metrics
+from app.core.metrics import Gauge
+from app.db.session import engine, replica_engines, pool_stats
+from app.utils.rate_limit import limiter_stats
+
+router = APIRouter(tags=["metrics"])
+
+
+# ---- Коллекторы, считаемые в момент scrape ----
+def _engines():
+    yield "primary", engine
+    for i, replica in enumerate(replica_engines):
+        yield f"replica{i}", replica
+
+
+def _pool_gauge(field: str):
+    return lambda: [({"engine": name}, pool_stats(e).get(field, 0)) for name, e in _engines()]
+
+
+Gauge("db_pool_size", "Configured connection pool size", ("engine",), collect=_pool_gauge("size"))
+Gauge("db_pool_checked_out", "Connections currently checked out of the pool", ("engine",),
+      collect=_pool_gauge("checkedout"))
+Gauge("db_pool_overflow", "Connections opened above pool_size (negative: unused slots)", ("engine",),
+      collect=_pool_gauge("overflow"))
+
+
+# Обе gauge за один scrape берут данные из одного обхода bucket'ов
+_rate_limit_snapshot = {"at": float("-inf"), "stats": []}
+
+
+async def _rate_limit_samples(field: str):
+    if time.monotonic() - _rate_limit_snapshot["at"] > 1:
+        _rate_limit_snapshot["stats"] = await limiter_stats()
+        _rate_limit_snapshot["at"] = time.monotonic()
+    return [({"limiter": s["name"]}, s.get(field, 0)) for s in _rate_limit_snapshot["stats"]]
+
+
+Gauge("rate_limit_active_buckets", "Token buckets that are not fully refilled", ("limiter",),
+      collect=lambda: _rate_limit_samples("active_buckets"))
+Gauge("rate_limit_depleted_buckets", "Token buckets with no tokens left", ("limiter",),
+      collect=lambda: _rate_limit_samples("depleted_buckets"))
+# rate_limit_rejected_total — счётчик в app/utils/rate_limit.py
+
+
+@router.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    return PlainTextResponse(await metrics.render(), media_type="text/plain; version=0.0.4")
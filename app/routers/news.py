@@ -1,19 +1,59 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import base64
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, delete, func, insert, or_
 from sqlalchemy.future import select
 from typing import List, Optional
 
-from app.db.session import get_db
+from app.core.config import settings
+from app.db.session import get_db, get_read_db
+from app.db.loaders import Loaders, get_loaders
+from app.db.search import index_news, search_query, unindex_news
+from app.db.upsert import insert_ignore
+from app.utils.change_feed import emit_change
+from app.utils.images import image_pipeline, save_upload
+from app.utils.tag_stats import GLOBAL, apply_tag_deltas, news_tag_ids, top_tags
 from app.models.news import News
-from app.models.tag import Tag
+from app.models.tag import Tag, news_tags
 from app.schemas.news import NewsCreate, NewsUpdate, NewsOut
+from app.schemas.tag import TagCount
 from app.models.user import User
 from app.dependencies import get_current_user
 from fastapi import Form, File, UploadFile
-from sqlalchemy.orm import selectinload
 
 router = APIRouter(prefix="/news", tags=["News"])
 
+
+# ---- Теги: весь список одним SELECT, недостающие — одним INSERT ... ON CONFLICT DO NOTHING ----
+async def _resolve_tags(db: AsyncSession, tags: List[str]) -> List[int]:
+    """Имена тегов -> id (в порядке запроса, без дублей); недостающие теги создаются."""
+    names = list(dict.fromkeys(n for n in (t.lower().strip() for t in tags) if n))
+    if not names:
+        return []
+
+    result = await db.execute(select(Tag.name, Tag.id).where(Tag.name.in_(names)))
+    ids = dict(result.all())
+    missing = [n for n in names if n not in ids]
+    if missing:
+        result = await db.execute(
+            insert_ignore(db, Tag.__table__, ["name"]).returning(Tag.name, Tag.id),
+            [{"name": n} for n in missing],
+        )
+        ids.update(result.all())
+        # тег успел создать параллельный запрос: в RETURNING его нет, дочитываем
+        raced = [n for n in missing if n not in ids]
+        if raced:
+            result = await db.execute(select(Tag.name, Tag.id).where(Tag.name.in_(raced)))
+            ids.update(result.all())
+    return [ids[n] for n in names]
+
+
+async def _link_tags(db: AsyncSession, news_id: int, tag_ids: List[int]) -> None:
+    if tag_ids:
+        await db.execute(insert(news_tags), [{"news_id": news_id, "tag_id": tag_id} for tag_id in tag_ids])
+
 # ✅ Создание новости
 @router.post("/", response_model=NewsOut)
 async def create_news(
@@ -34,13 +74,10 @@ async def create_news(
     else:
         raise HTTPException(status_code=403, detail="Недостаточно прав")
 
-    # 📂 Сохраняем файл
+    # 📂 Сохраняем файл (потоково), уменьшенные копии строит фоновый воркер после commit
     image_url = None
     if img:
-        file_path = f"uploads/{img.filename}"
-        with open(file_path, "wb") as buffer:
-            buffer.write(await img.read())
-        image_url = file_path
+        image_url = await save_upload(img)
 
     # ✅ Создаём новость
     new_news = News(
@@ -50,39 +87,146 @@ async def create_news(
         university_id=university_id,
     )
 
+    db.add(new_news)
+    await db.flush()
+    await index_news(db, new_news)
+
     # ✅ Добавляем теги (если переданы)
     if tags:
-        new_tags = []
-        for tag_name in tags:
-            tag_name = tag_name.lower().strip()
-            result = await db.execute(select(Tag).where(Tag.name == tag_name))
-            tag = result.scalar_one_or_none()
-            if not tag:
-                tag = Tag(name=tag_name)
-                db.add(tag)
-            new_tags.append(tag)
-
-        new_news.tags = new_tags
+        tag_ids = await _resolve_tags(db, tags)
+        await _link_tags(db, new_news.id, tag_ids)
+        await apply_tag_deltas(db, new_news.university_id, added=tag_ids)
 
-    db.add(new_news)
     await db.commit()
+    await emit_change("news", new_news.id, new_news.university_id, "create")
+    if image_url:
+        image_pipeline.enqueue(new_news.id, image_url)
     await db.refresh(new_news)
+    await Loaders(db).news_tags.attach([new_news])
 
     return new_news
 
-# ✅ Получение всех новостей (с фильтром по тегу)
+# ---- Курсор ленты: base64("<date iso>|<id>") последней новости страницы ----
+def _encode_cursor(news: News) -> str:
+    return base64.urlsafe_b64encode(f"{news.date.isoformat()}|{news.id}".encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        date, _, news_id = base64.urlsafe_b64decode(cursor.encode()).decode().partition("|")
+        return datetime.fromisoformat(date), int(news_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _encode_search_cursor(score: float, news_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{score!r}|{news_id}".encode()).decode()
+
+
+def _decode_search_cursor(cursor: str) -> tuple[float, int]:
+    try:
+        score, _, news_id = base64.urlsafe_b64decode(cursor.encode()).decode().partition("|")
+        return float(score), int(news_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _feed_query(
+    university_id: Optional[int],
+    tag_names: List[str],
+    tag_mode: str,
+    after: Optional[tuple[datetime, int]],
+    limit: int,
+):
+    """Лента: новые сверху; after — (date, id) последней новости предыдущей страницы."""
+    query = select(News).order_by(News.date.desc(), News.id.desc()).limit(limit)
+
+    if university_id is not None:
+        query = query.where(News.university_id == university_id)
+
+    if tag_names:
+        tagged = (
+            select(news_tags.c.news_id)
+            .join(Tag, Tag.id == news_tags.c.tag_id)
+            .where(Tag.name.in_(tag_names))
+        )
+        if tag_mode == "all":
+            tagged = tagged.group_by(news_tags.c.news_id).having(func.count(Tag.id) == len(tag_names))
+        query = query.where(News.id.in_(tagged))
+
+    if after is not None:
+        date, news_id = after
+        query = query.where(or_(News.date < date, and_(News.date == date, News.id < news_id)))
+    return query
+
+
+# ✅ Получение новостей: keyset по (date, id), фильтры по университету и тегам (any/all).
+# Следующая страница — ?cursor=<X-Next-Cursor>; заголовка нет — страница последняя
 @router.get("/", response_model=List[NewsOut])
 async def get_all_news(
+    response: Response,
+    university_id: Optional[int] = None,
     tag: Optional[str] = None,
-    db: AsyncSession = Depends(get_db),
+    tags: Optional[List[str]] = Query(None),
+    tag_mode: str = Query("any", pattern="^(any|all)$"),
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.NEWS_PAGE_SIZE, ge=1, le=settings.NEWS_PAGE_MAX),
+    db: AsyncSession = Depends(get_read_db),
+    loaders: Loaders = Depends(get_loaders),
 ):
-    query = select(News).order_by(News.date.desc())
+    names = list(dict.fromkeys(t.lower().strip() for t in [*(tags or []), *([tag] if tag else [])]))
+    after = _decode_cursor(cursor) if cursor else None
+    result = await db.execute(_feed_query(university_id, names, tag_mode, after, limit + 1))
+    news = result.scalars().all()
+    if len(news) > limit:
+        news = news[:limit]
+        response.headers["X-Next-Cursor"] = _encode_cursor(news[-1])
+    return await loaders.news_tags.attach(news)
 
-    if tag:
-        query = query.join(News.tags).where(Tag.name == tag.lower())
 
-    result = await db.execute(query)
-    return result.scalars().unique().all()
+# ✅ Поиск по заголовку и тексту, по релевантности. Keyset по (score, id): ?cursor=<X-Next-Cursor>
+@router.get("/search", response_model=List[NewsOut])
+async def search_news(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    university_id: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.NEWS_PAGE_SIZE, ge=1, le=settings.NEWS_PAGE_MAX),
+    db: AsyncSession = Depends(get_read_db),
+    loaders: Loaders = Depends(get_loaders),
+):
+    if not q.strip():
+        return []
+    query, score = search_query(db, q)
+    if university_id is not None:
+        query = query.where(News.university_id == university_id)
+    if date_from is not None:
+        query = query.where(News.date >= date_from)
+    if date_to is not None:
+        query = query.where(News.date < date_to)
+    if cursor:
+        last_score, last_id = _decode_search_cursor(cursor)
+        query = query.where(or_(score > last_score, and_(score == last_score, News.id > last_id)))
+
+    result = await db.execute(query.order_by(score, News.id).limit(limit + 1))
+    rows = result.all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = _encode_search_cursor(rows[-1].score, rows[-1].News.id)
+    return await loaders.news_tags.attach([row.News for row in rows])
+
+
+# ✅ Популярные теги: университета или по всем (без university_id) — из счётчиков tag_stats
+@router.get("/tags/top", response_model=List[TagCount])
+async def get_top_tags(
+    university_id: Optional[int] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
+):
+    rows = await top_tags(db, university_id if university_id is not None else GLOBAL, limit)
+    return [TagCount(id=row.id, name=row.name, count=row.count) for row in rows]
 
 
 # ✅ Обновление новости
@@ -96,10 +240,7 @@ async def update_news(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    # Загружаем сразу с тегами
-    result = await db.execute(
-        select(News).options(selectinload(News.tags)).where(News.id == news_id)
-    )
+    result = await db.execute(select(News).where(News.id == news_id))
     news = result.scalar_one_or_none()
     if not news:
         raise HTTPException(status_code=404, detail="Новость не найдена")
@@ -110,28 +251,26 @@ async def update_news(
         news.description = description
 
     if img:
-        file_path = f"uploads/{img.filename}"
-        with open(file_path, "wb") as buffer:
-            buffer.write(await img.read())
-        news.img = file_path
+        news.img = await save_upload(img)
+        news.img_variants = None
 
     if tags is not None:
-        new_tags = []
-        for tag_name in tags:
-            tag_name = tag_name.lower().strip()
-            result = await db.execute(select(Tag).where(Tag.name == tag_name))
-            tag = result.scalar_one_or_none()
-            if not tag:
-                tag = Tag(name=tag_name)
-                db.add(tag)
-            new_tags.append(tag)
-
+        tag_ids = await _resolve_tags(db, tags)
+        old_tag_ids = await news_tag_ids(db, news.id)
         # заменяем существующие связи
-        news.tags.clear()
-        news.tags.extend(new_tags)
+        await db.execute(delete(news_tags).where(news_tags.c.news_id == news.id))
+        await _link_tags(db, news.id, tag_ids)
+        await apply_tag_deltas(db, news.university_id, added=tag_ids, removed=old_tag_ids)
+
+    if title is not None or description is not None:
+        await index_news(db, news)
 
     await db.commit()
+    await emit_change("news", news_id, news.university_id, "update")
+    if img:
+        image_pipeline.enqueue(news_id, news.img)
     await db.refresh(news)
+    await Loaders(db).news_tags.attach([news])
     return news
 
 # ✅ Удаление новости
@@ -150,7 +289,10 @@ async def delete_news(
     if current_user.role == "superadmin" and news.university_id != current_user.university_id:
         raise HTTPException(status_code=403, detail="Нет доступа")
 
+    await apply_tag_deltas(db, news.university_id, removed=await news_tag_ids(db, news_id))
+    await unindex_news(db, news_id)
     await db.delete(news)
     await db.commit()
+    await emit_change("news", news_id, news.university_id, "delete")
 
     return {"message": "Новость удалена"}
@@ -1,8 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
-from openpyxl.workbook import Workbook
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from app.db.session import get_db
+from app.db.session import get_read_db
 from app.models.university import University
 from app.models.direction import Direction
 from app.models.subject import Subject
@@ -12,16 +11,21 @@ from io import BytesIO
 from app.dependencies import require_owner_or_superadmin
 from sqlalchemy.orm import selectinload
 from collections import defaultdict
-from openpyxl.utils import get_column_letter
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from time import perf_counter
+from app.core.metrics import EXPORT_DURATION
 
 router = APIRouter(prefix="/statistics", tags=["statistics"])
 
 @router.get("/export")
 async def export_statistics(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user=Depends(require_owner_or_superadmin)
 ):
+    # openpyxl тяжёлый — импортируем только при экспорте, а не на старте процесса
+    from openpyxl.workbook import Workbook
+    from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+
+    started = perf_counter()
     # Загружаем университеты с selectinload связей
     if current_user.role == "superadmin":
         query = (
@@ -182,6 +186,7 @@ async def export_statistics(
     stream = BytesIO()
     wb.save(stream)
     stream.seek(0)
+    EXPORT_DURATION.observe(perf_counter() - started, format="xlsx")
 
     return StreamingResponse(
         stream,
@@ -3,7 +3,7 @@ from fastapi import APIRouter, Depends
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
+from app.db.session import get_read_db
 from app.models.university import University
 from app.models.direction import Direction
 from app.models.subject import Subject
@@ -14,7 +14,7 @@ router = APIRouter(prefix="/stats", tags=["stats"])
 
 @router.get("/owner-universities")
 async def owner_universities_stats(
-        db: AsyncSession = Depends(get_db),
+        db: AsyncSession = Depends(get_read_db),
         current_user=Depends(get_current_user)
 ):
     # Ограничиваем доступ только для owner или superadmin
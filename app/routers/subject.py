@@ -1,41 +1,96 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from pydantic import ValidationError
+from sqlalchemy import case, delete, func, insert, nulls_last, select, tuple_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.db.session import get_db
+from app.core.config import settings
+from app.db.session import get_db, get_read_db
+from app.db.aggregates import aggregate_ids, split_ids
+from app.utils.change_feed import emit_change
 from app.models.direction import Direction
-from app.models.subject import Subject
-from app.schemas.subject import SubjectCreate, SubjectOut, SubjectUpdate
+from app.models.literature import Literature
+from app.models.subject import Subject, subject_directions
+from app.schemas.subject import (
+    SubjectCoverage, SubjectCreate, SubjectOut, SubjectRelink, SubjectRelinkResult, SubjectUpdate,
+)
 from app.dependencies import get_current_user
 
 router = APIRouter(prefix="/subjects", tags=["subjects"])
 
 
 # ---- Получение ----
-@router.get("/", response_model=List[SubjectOut])
-async def get_subjects(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(
-        select(Subject).options(selectinload(Subject.directions))
+# direction_ids агрегируются в том же запросе (array_agg / group_concat) —
+# ни Direction, ни Subject ORM-объекты не создаются
+def _subject_rows_query(
+    university_id: Optional[int],
+    kafedra_id: Optional[int],
+    direction_id: Optional[int],
+    limit: Optional[int],
+    offset: int,
+):
+    query = (
+        select(
+            Subject.id,
+            Subject.name,
+            Subject.kafedra_id,
+            Subject.university_id,
+            aggregate_ids(subject_directions.c.direction_id).label("direction_ids"),
+        )
+        .outerjoin(subject_directions, subject_directions.c.subject_id == Subject.id)
+        .group_by(Subject.id, Subject.name, Subject.kafedra_id, Subject.university_id)
+        .order_by(Subject.id)
+        .offset(offset)
+        .limit(limit)
     )
-    subjects = result.scalars().unique().all()
-
+    if university_id is not None:
+        query = query.where(Subject.university_id == university_id)
+    if kafedra_id is not None:
+        query = query.where(Subject.kafedra_id == kafedra_id)
+    if direction_id is not None:
+        # фильтр подзапросом: в direction_ids остаются все направления предмета
+        query = query.where(Subject.id.in_(
+            select(subject_directions.c.subject_id).where(subject_directions.c.direction_id == direction_id)
+        ))
+    return query
+
+
+async def _list_subjects(db: AsyncSession, **filters) -> List[SubjectOut]:
+    result = await db.execute(_subject_rows_query(**filters))
     return [
         SubjectOut(
-            id=s.id,
-            name=s.name,
-            kafedra_id=s.kafedra_id,
-            university_id=s.university_id,
-            direction_ids=[d.id for d in s.directions],
+            id=row.id,
+            name=row.name,
+            kafedra_id=row.kafedra_id,
+            university_id=row.university_id,
+            direction_ids=split_ids(row.direction_ids),
         )
-        for s in subjects
+        for row in result
     ]
 
+
+@router.get("/", response_model=List[SubjectOut])
+async def get_subjects(
+    kafedra_id: Optional[int] = None,
+    direction_id: Optional[int] = None,
+    limit: Optional[int] = Query(None, ge=1, le=settings.SUBJECTS_PAGE_MAX),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_read_db),
+):
+    return await _list_subjects(
+        db, university_id=None, kafedra_id=kafedra_id, direction_id=direction_id, limit=limit, offset=offset
+    )
+
 @router.get("/university/{university_id}", response_model=List[SubjectOut])
 async def get_subjects_by_university(
     university_id: int,
-    db: AsyncSession = Depends(get_db),
+    kafedra_id: Optional[int] = None,
+    direction_id: Optional[int] = None,
+    limit: Optional[int] = Query(None, ge=1, le=settings.SUBJECTS_PAGE_MAX),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_read_db),
     current_user=Depends(get_current_user)
 ):
     # 🔒 Ограничение по ролям
@@ -44,106 +99,351 @@ async def get_subjects_by_university(
     if current_user.role not in ("owner", "superadmin"):
         raise HTTPException(status_code=403, detail="Not allowed")
 
-    result = await db.execute(
-        select(Subject)
-        .options(selectinload(Subject.directions))
-        .where(Subject.university_id == university_id)
+    return await _list_subjects(
+        db, university_id=university_id, kafedra_id=kafedra_id, direction_id=direction_id, limit=limit, offset=offset
+    )
+
+# ---- Обеспеченность литературой ---- (owner / superadmin)
+# Литература и направления агрегируются отдельными подзапросами по subject_id,
+# чтобы суммы не размножались join'ом; процент считается в SQL (сортировка и пагинация — в БД)
+COVERAGE_SORTS = ("coverage", "literature_count", "printed_total", "name")
+
+
+def _coverage_query(university_id: Optional[int], kafedra_id: Optional[int], missing_only: bool):
+    subject_filters = []
+    if university_id is not None:
+        subject_filters.append(Subject.university_id == university_id)
+    if kafedra_id is not None:
+        subject_filters.append(Subject.kafedra_id == kafedra_id)
+    # фильтр по вузу/кафедре — и внутри агрегатов: иначе GROUP BY проходит литературу и связи всех вузов
+    scoped_ids = select(Subject.id).where(*subject_filters)
+    literature_scope = [Literature.subject_id.in_(scoped_ids)] if subject_filters else []
+    directions_scope = [subject_directions.c.subject_id.in_(scoped_ids)] if subject_filters else []
+
+    literature = (
+        select(
+            Literature.subject_id.label("subject_id"),
+            func.count(Literature.id).label("literature_count"),
+            func.coalesce(func.sum(Literature.printed_count), 0).label("printed_total"),
+            func.count(Literature.file_path).label("electronic_count"),
+        )
+        .where(*literature_scope)
+        .group_by(Literature.subject_id)
+        .subquery()
+    )
+    directions = (
+        select(
+            subject_directions.c.subject_id.label("subject_id"),
+            func.max(Direction.student_count).label("max_students"),
+        )
+        .join(Direction, Direction.id == subject_directions.c.direction_id)
+        .where(*directions_scope)
+        .group_by(subject_directions.c.subject_id)
+        .subquery()
     )
-    subjects = result.scalars().unique().all()
 
+    literature_count = func.coalesce(literature.c.literature_count, 0)
+    printed_total = func.coalesce(literature.c.printed_total, 0)
+    has_electronic = func.coalesce(literature.c.electronic_count, 0) > 0
+    # min(int(K * 6 / T * 100), 100) из экспорта; T <= 0 считается как 1
+    students = case((directions.c.max_students > 0, directions.c.max_students), else_=1)
+    available = case(
+        (directions.c.subject_id.is_(None), None),
+        (has_electronic, 100),
+        (printed_total * 600 >= students * 100, 100),
+        else_=(printed_total * 600) // students,
+    )
+
+    query = (
+        select(
+            Subject.id,
+            Subject.name,
+            Subject.kafedra_id,
+            Subject.university_id,
+            literature_count.label("literature_count"),
+            printed_total.label("printed_total"),
+            has_electronic.label("has_electronic"),
+            available.label("min_available_percent"),
+        )
+        .outerjoin(literature, literature.c.subject_id == Subject.id)
+        .outerjoin(directions, directions.c.subject_id == Subject.id)
+        .where(*subject_filters)
+    )
+    if missing_only:
+        query = query.where(literature_count == 0)
+    return query, {
+        "coverage": available,
+        "literature_count": literature_count,
+        "printed_total": printed_total,
+        "name": Subject.name,
+    }
+
+
+@router.get("/coverage", response_model=List[SubjectCoverage])
+async def get_subjects_coverage(
+    university_id: Optional[int] = None,
+    kafedra_id: Optional[int] = None,
+    missing_only: bool = False,
+    sort: str = Query("coverage", pattern="^(" + "|".join(COVERAGE_SORTS) + ")$"),
+    desc: bool = False,
+    limit: int = Query(100, ge=1, le=settings.SUBJECTS_PAGE_MAX),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_read_db),
+    current_user=Depends(get_current_user)
+):
+    if current_user.role == "superadmin":
+        if university_id is not None and university_id != current_user.university_id:
+            raise HTTPException(status_code=403, detail="Not your university")
+        university_id = current_user.university_id
+    elif current_user.role != "owner":
+        raise HTTPException(status_code=403, detail="Not allowed")
+
+    query, sorts = _coverage_query(university_id, kafedra_id, missing_only)
+    order = sorts[sort].desc() if desc else sorts[sort].asc()
+    # предметы без направлений (процент NULL) — в конце при любом направлении сортировки
+    result = await db.execute(
+        query.order_by(nulls_last(order), Subject.id).offset(offset).limit(limit)
+    )
     return [
-        SubjectOut(
-            id=s.id,
-            name=s.name,
-            kafedra_id=s.kafedra_id,
-            university_id=s.university_id,
-            direction_ids=[d.id for d in s.directions],
+        SubjectCoverage(
+            id=row.id,
+            name=row.name,
+            kafedra_id=row.kafedra_id,
+            university_id=row.university_id,
+            literature_count=row.literature_count,
+            printed_total=row.printed_total,
+            has_electronic=bool(row.has_electronic),
+            min_available_percent=None if row.min_available_percent is None else int(row.min_available_percent),
         )
-        for s in subjects
+        for row in result
     ]
 
 # ---- Создание нескольких предметов ---- (owner / superadmin)
-@router.post("/bulk", response_model=List[SubjectOut])
-async def create_subjects_bulk(
-    subjects: List[SubjectCreate],
-    db: AsyncSession = Depends(get_db),
-    current_user=Depends(get_current_user)
-):
-    if len(subjects) > 10:
-        raise HTTPException(status_code=400, detail="Limit is 10 subjects at once")
-
-    created_subjects = []
-
-    for item in subjects:
-        if current_user.role == "superadmin":
-            item.university_id = current_user.university_id
-        elif current_user.role == "owner":
-            if not item.university_id:
-                raise HTTPException(
-                    status_code=400,
-                    detail="university_id is required for owner"
-                )
-        else:
-            raise HTTPException(status_code=403, detail="Not allowed")
-
-        # Проверка направлений
-        result = await db.execute(
-            select(Direction).where(
-                Direction.id.in_(item.direction_ids),
-                Direction.university_id == item.university_id
+# Проверки и вставка — набором: один запрос на направления, один на уникальность,
+# multi-row INSERT ... RETURNING и один INSERT в subject_directions на пачку
+def _normalize_bulk_item(item: SubjectCreate, current_user) -> SubjectCreate:
+    if current_user.role == "superadmin":
+        item.university_id = current_user.university_id
+    elif current_user.role == "owner":
+        if not item.university_id:
+            raise HTTPException(
+                status_code=400,
+                detail="university_id is required for owner"
             )
-        )
-        directions = result.scalars().all()
-        if len(directions) != len(item.direction_ids):
+    else:
+        raise HTTPException(status_code=403, detail="Not allowed")
+    return item
+
+
+async def _insert_subjects(db: AsyncSession, items: List[SubjectCreate], seen: set) -> List[SubjectOut]:
+    """Проверяет и вставляет пачку (без commit). seen — ключи уникальности из предыдущих пачек запроса."""
+    for item in items:
+        key = (item.name, item.kafedra_id, item.university_id)
+        if key in seen:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Subject '{item.name}' is duplicated in the request"
+            )
+        seen.add(key)
+
+    # Проверка направлений: все id пачки одним запросом
+    direction_ids = {d for item in items for d in item.direction_ids}
+    result = await db.execute(
+        select(Direction.id, Direction.university_id).where(Direction.id.in_(direction_ids))
+    )
+    direction_university = dict(result.all())
+    for item in items:
+        if any(direction_university.get(d) != item.university_id for d in item.direction_ids):
             raise HTTPException(
                 status_code=404,
                 detail=f"Some directions not found for {item.name} in university {item.university_id}"
             )
 
-        # ✅ Проверка на уникальность (имя + кафедра + университет)
-        existing = await db.execute(
-            select(Subject).where(
-                Subject.name == item.name,
-                Subject.kafedra_id == item.kafedra_id,
-                Subject.university_id == item.university_id
+    # ✅ Проверка на уникальность (имя + кафедра + университет) — одним запросом
+    existing = await db.execute(
+        select(Subject.name).where(
+            tuple_(Subject.name, Subject.kafedra_id, Subject.university_id).in_(
+                [(item.name, item.kafedra_id, item.university_id) for item in items]
             )
+        ).limit(1)
+    )
+    duplicate = existing.scalar()
+    if duplicate is not None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Subject '{duplicate}' already exists in this kafedra and university"
         )
-        if existing.scalars().first():
-            raise HTTPException(
-                status_code=400,
-                detail=f"Subject '{item.name}' already exists in this kafedra and university"
-            )
 
-        subject = Subject(
+    # порядок RETURNING не гарантирован (sort_by_parameter_order на SQLite откатывается
+    # к построчной вставке) — сопоставляем id по ключу уникальности
+    result = await db.execute(
+        insert(Subject).returning(Subject.id, Subject.name, Subject.kafedra_id, Subject.university_id),
+        [{"name": i.name, "kafedra_id": i.kafedra_id, "university_id": i.university_id} for i in items],
+    )
+    id_by_key = {(name, kafedra_id, university_id): id for id, name, kafedra_id, university_id in result}
+    ids = [id_by_key[(i.name, i.kafedra_id, i.university_id)] for i in items]
+
+    links = [
+        {"subject_id": subject_id, "direction_id": direction_id}
+        for subject_id, item in zip(ids, items)
+        for direction_id in sorted(set(item.direction_ids))
+    ]
+    if links:
+        await db.execute(insert(subject_directions), links)
+
+    return [
+        SubjectOut(
+            id=subject_id,
             name=item.name,
             kafedra_id=item.kafedra_id,
             university_id=item.university_id,
-            directions=directions
+            direction_ids=sorted(set(item.direction_ids)),
         )
-        db.add(subject)
-        created_subjects.append(subject)
+        for subject_id, item in zip(ids, items)
+    ]
 
-    await db.commit()
 
-    # ✅ подгружаем связи directions заново
-    ids = [s.id for s in created_subjects]
-    result = await db.execute(
-        select(Subject)
-        .options(selectinload(Subject.directions))
-        .where(Subject.id.in_(ids))
-    )
-    subjects_with_dirs = result.scalars().unique().all()
+async def _commit_bulk(db: AsyncSession, created: List[SubjectOut]) -> None:
+    try:
+        await db.commit()
+    except IntegrityError:
+        # параллельный запрос успел вставить такой же предмет (uq_subject_name_kafedra_university)
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Some subjects already exist in this kafedra and university")
+    # одно событие на университет, а не на каждую из тысяч строк
+    for university_id in sorted({s.university_id for s in created}):
+        await emit_change("subjects", None, university_id, "bulk_create")
 
-    return [
-        SubjectOut(
-            id=s.id,
-            name=s.name,
-            kafedra_id=s.kafedra_id,
-            university_id=s.university_id,
-            direction_ids=[d.id for d in s.directions],
+
+@router.post("/bulk", response_model=List[SubjectOut])
+async def create_subjects_bulk(
+    subjects: List[SubjectCreate],
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(get_current_user)
+):
+    if len(subjects) > settings.SUBJECTS_BULK_LIMIT:
+        raise HTTPException(status_code=400, detail=f"Limit is {settings.SUBJECTS_BULK_LIMIT} subjects at once")
+    if not subjects:
+        return []
+
+    items = [_normalize_bulk_item(item, current_user) for item in subjects]
+    seen: set = set()
+    created = []
+    for i in range(0, len(items), settings.SUBJECTS_BULK_CHUNK):
+        created += await _insert_subjects(db, items[i:i + settings.SUBJECTS_BULK_CHUNK], seen)
+    await _commit_bulk(db, created)
+    return created
+
+
+# ---- То же потоком: тело application/x-ndjson, один SubjectCreate на строку ----
+# Тело не буферизуется целиком: строки проверяются и вставляются пачками по мере чтения,
+# commit — один в конце (всё или ничего)
+@router.post("/bulk/stream", response_model=List[SubjectOut])
+async def create_subjects_bulk_stream(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(get_current_user)
+):
+    seen: set = set()
+    created: List[SubjectOut] = []
+    batch: List[SubjectCreate] = []
+    line_no = 0
+    buffer = b""
+
+    async def flush():
+        nonlocal batch
+        if batch:
+            created.extend(await _insert_subjects(db, batch, seen))
+            batch = []
+
+    async def parse(line: bytes):
+        nonlocal line_no
+        line_no += 1
+        if not line.strip():
+            return
+        try:
+            item = SubjectCreate.model_validate_json(line)
+        except ValidationError as exc:
+            raise HTTPException(status_code=422, detail={"line": line_no, "errors": exc.errors(include_url=False)})
+        batch.append(_normalize_bulk_item(item, current_user))
+        if len(created) + len(batch) > settings.SUBJECTS_BULK_STREAM_LIMIT:
+            raise HTTPException(status_code=400, detail=f"Limit is {settings.SUBJECTS_BULK_STREAM_LIMIT} subjects per stream")
+        if len(batch) >= settings.SUBJECTS_BULK_CHUNK:
+            await flush()
+
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            await parse(line)
+    await parse(buffer)
+    await flush()
+
+    if created:
+        await _commit_bulk(db, created)
+    return created
+
+
+# ---- Массовая перепривязка направлений ---- (owner / superadmin)
+# Одно INSERT ... SELECT и одно DELETE по subject_directions, один commit.
+# Университет проверяется в самом SQL: направление привязывается только к предметам
+# своего университета, superadmin трогает только предметы своего университета
+@router.post("/relink", response_model=SubjectRelinkResult)
+async def relink_subjects(
+    data: SubjectRelink,
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(get_current_user)
+):
+    if current_user.role not in ("owner", "superadmin"):
+        raise HTTPException(status_code=403, detail="Not allowed")
+    if len(data.subject_ids) > settings.SUBJECTS_BULK_LIMIT:
+        raise HTTPException(status_code=400, detail=f"Limit is {settings.SUBJECTS_BULK_LIMIT} subjects at once")
+    if set(data.add_direction_ids) & set(data.remove_direction_ids):
+        raise HTTPException(status_code=400, detail="Direction can't be added and removed at once")
+
+    scoped_subjects = select(Subject.id).where(Subject.id.in_(data.subject_ids))
+    if current_user.role == "superadmin":
+        scoped_subjects = scoped_subjects.where(Subject.university_id == current_user.university_id)
+
+    removed = 0
+    if data.subject_ids and data.remove_direction_ids:
+        result = await db.execute(
+            delete(subject_directions).where(
+                subject_directions.c.subject_id.in_(scoped_subjects),
+                subject_directions.c.direction_id.in_(data.remove_direction_ids),
+            )
         )
-        for s in subjects_with_dirs
-    ]
+        removed = result.rowcount
+
+    added = 0
+    if data.subject_ids and data.add_direction_ids:
+        existing = select(subject_directions.c.subject_id).where(
+            subject_directions.c.subject_id == Subject.id,
+            subject_directions.c.direction_id == Direction.id,
+        ).exists()
+        pairs = (
+            select(Subject.id, Direction.id)
+            .join(Direction, Direction.university_id == Subject.university_id)
+            .where(
+                Subject.id.in_(scoped_subjects),
+                Direction.id.in_(data.add_direction_ids),
+                ~existing,
+            )
+        )
+        result = await db.execute(
+            insert(subject_directions).from_select(["subject_id", "direction_id"], pairs)
+        )
+        added = result.rowcount
+
+    if not added and not removed:
+        return SubjectRelinkResult(added=0, removed=0)
+
+    universities = await db.execute(select(Subject.university_id).where(Subject.id.in_(scoped_subjects)).distinct())
+    university_ids = universities.scalars().all()
+    await db.commit()
+    for university_id in sorted(university_ids):
+        await emit_change("subjects", None, university_id, "relink")
+    return SubjectRelinkResult(added=added, removed=removed)
 
 
 # ---- Обновление ---- (owner / superadmin)
@@ -205,10 +505,12 @@ async def update_subject(
                 detail=f"Subject '{new_name}' already exists in this kafedra and university"
             )
 
+    previous_university_id = subject.university_id
     for field, value in update_data.items():
         setattr(subject, field, value)
 
     await db.commit()
+    await emit_change("subjects", subject.id, subject.university_id, "update", previous_university_id)
     await db.refresh(subject)
 
     return SubjectOut(
@@ -238,4 +540,5 @@ async def delete_subject(
 
     await db.delete(subject)
     await db.commit()
+    await emit_change("subjects", subject_id, subject.university_id, "delete")
     return None
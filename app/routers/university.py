@@ -1,11 +1,22 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func
 from sqlalchemy.future import select
 
 from app.models.university import University
-from app.schemas.university import UniversityCreate, UniversityOut, UniversityUpdate
-from app.db.session import get_db
+from app.models.direction import Direction
+from app.models.kafedra import Kafedra
+from app.models.subject import Subject, subject_directions
+from app.models.literature import Literature
+from app.schemas.university import (
+    UniversityCreate, UniversityOut, UniversityUpdate,
+    UniversityTree, TreeDirection, TreeKafedra, TreeSubject,
+)
+from app.db.session import get_db, get_read_db
+from app.utils.change_feed import emit_change
+from app.db.search import unindex_university
+from app.utils.tag_stats import drop_university
 from app.dependencies import get_current_user, require_owner_or_superadmin
 
 router = APIRouter(prefix="/universities", tags=["universities"])
@@ -13,20 +24,84 @@ router = APIRouter(prefix="/universities", tags=["universities"])
 
 # ---- Получение списка ----
 @router.get("/", response_model=List[UniversityOut])
-async def get_universities(db: AsyncSession = Depends(get_db)):
+async def get_universities(db: AsyncSession = Depends(get_read_db)):
     result = await db.execute(select(University))
     return result.scalars().all()
 
 @router.get("/{uni_id}", response_model=UniversityOut)
 async def get_university(
     uni_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     uni = await db.get(University, uni_id)
     if not uni:
         raise HTTPException(status_code=404, detail="University not found")
     return uni
 
+def _tree_queries(uni_id: int) -> dict:
+    """Запросы дерева университета (кроме самого University) — каждый по индексу university_id."""
+    return {
+        "directions": (
+            select(Direction.id, Direction.number, Direction.name, Direction.course, Direction.student_count)
+            .where(Direction.university_id == uni_id)
+            .order_by(Direction.id)
+        ),
+        "kafedras": select(Kafedra.id, Kafedra.name).where(Kafedra.university_id == uni_id).order_by(Kafedra.id),
+        "subjects": (
+            select(Subject.id, Subject.name, Subject.kafedra_id, func.count(Literature.id))
+            .outerjoin(Literature, Literature.subject_id == Subject.id)
+            .where(Subject.university_id == uni_id)
+            .group_by(Subject.id, Subject.name, Subject.kafedra_id)
+            .order_by(Subject.id)
+        ),
+        "links": (
+            select(subject_directions.c.subject_id, subject_directions.c.direction_id)
+            .join(Subject, Subject.id == subject_directions.c.subject_id)
+            .where(Subject.university_id == uni_id)
+        ),
+    }
+
+
+# ---- Дерево: направления + кафедры → предметы (id направлений, число литературы) ----
+# Фиксированные 5 запросов независимо от размера университета; кэшируется по ETag
+@router.get("/{uni_id}/tree", response_model=UniversityTree)
+async def get_university_tree(
+    uni_id: int,
+    db: AsyncSession = Depends(get_read_db),
+):
+    uni = await db.get(University, uni_id)
+    if not uni:
+        raise HTTPException(status_code=404, detail="University not found")
+
+    queries = _tree_queries(uni_id)
+    directions = await db.execute(queries["directions"])
+    kafedras = await db.execute(queries["kafedras"])
+    subjects = await db.execute(queries["subjects"])
+    links = await db.execute(queries["links"])
+
+    direction_ids: dict[int, list[int]] = {}
+    for subject_id, direction_id in links:
+        direction_ids.setdefault(subject_id, []).append(direction_id)
+
+    tree_kafedras = {k.id: TreeKafedra(id=k.id, name=k.name) for k in kafedras}
+    for subject_id, name, kafedra_id, literature_count in subjects:
+        kafedra = tree_kafedras.get(kafedra_id)
+        if kafedra is not None:
+            kafedra.subjects.append(TreeSubject(
+                id=subject_id,
+                name=name,
+                direction_ids=sorted(direction_ids.get(subject_id, [])),
+                literature_count=literature_count,
+            ))
+
+    return UniversityTree(
+        id=uni.id,
+        name=uni.name,
+        directions=[TreeDirection(**d._mapping) for d in directions],
+        kafedras=list(tree_kafedras.values()),
+    )
+
+
 # ---- Создание ---- (только owner)
 @router.post("/", response_model=UniversityOut)
 async def create_university(
@@ -40,6 +115,7 @@ async def create_university(
     new_uni = University(**uni_data.model_dump())  # pydantic v2
     db.add(new_uni)
     await db.commit()
+    await emit_change("universities", new_uni.id, new_uni.id, "create")
     await db.refresh(new_uni)
     return new_uni
 
@@ -63,6 +139,7 @@ async def update_university(
         setattr(uni, field, value)
 
     await db.commit()
+    await emit_change("universities", uni_id, uni_id, "update")
     await db.refresh(uni)
     return uni
 
@@ -81,5 +158,8 @@ async def delete_university(
     if not uni:
         raise HTTPException(status_code=404, detail="University not found")
 
+    await drop_university(db, uni_id)  # новости удалятся каскадом — их теги из глобальных счётчиков
+    await unindex_university(db, uni_id)  # и их строки из поискового индекса
     await db.delete(uni)
     await db.commit()
+    await emit_change("universities", uni_id, uni_id, "delete")
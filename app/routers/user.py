@@ -1,13 +1,43 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
 from app.models.user import User
-from app.db.session import get_db
-from app.schemas.user import UserUpdate, UserOut
+from app.db.listing import keyset_page, prefix_match
+from app.db.session import get_db, get_read_db
+from app.schemas.user import UserListItem, UserUpdate, UserOut
 from app.dependencies import require_user, require_owner
 from sqlalchemy.future import select
 
 router = APIRouter(prefix="/users", tags=["users"])
 
+
+# --- список пользователей (owner): поиск по префиксу email/имени/фамилии, фильтры, keyset ---
+@router.get("/", response_model=List[UserListItem])
+async def list_users(
+    response: Response,
+    q: Optional[str] = Query(None, max_length=100),
+    role: Optional[str] = None,
+    university_id: Optional[int] = None,
+    is_active: Optional[bool] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.ACCOUNTS_PAGE_SIZE, ge=1, le=settings.ACCOUNTS_PAGE_MAX),
+    db: AsyncSession = Depends(get_read_db),
+    current_user = Depends(require_owner),
+):
+    query = select(User)
+    if q and q.strip():
+        query = query.where(prefix_match(q, User.email, User.first_name, User.last_name))
+    if role is not None:
+        query = query.where(User.role == role)
+    if university_id is not None:
+        query = query.where(User.university_id == university_id)
+    if is_active is not None:
+        query = query.where(User.is_active == is_active)
+    return await keyset_page(db, query, User.id, cursor, limit, response)
+
+
 @router.put("/me")
 async def update_me(
     user_data: UserUpdate,
@@ -1,6 +1,8 @@
 # schemas/direction.py
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List
+
+from app.schemas.subject import SubjectBrief
 
 class DirectionBase(BaseModel):
     number: str
@@ -24,3 +26,16 @@ class DirectionOut(DirectionBase):
 
     class Config:
         from_attributes = True
+
+class DirectionBrief(BaseModel):
+    id: int
+    number: str
+    name: str
+    course: int
+
+    class Config:
+        from_attributes = True
+
+# GET /directions/: Direction.subjects подгружаются загрузчиком (один запрос на список)
+class DirectionWithSubjects(DirectionOut):
+    subjects: List[SubjectBrief] = []
@@ -1,7 +1,9 @@
 # schemas/literature.py
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List
 from app.schemas.enums import LanguageEnum, FontTypeEnum, ConditionEnum, UsageStatusEnum
+from app.schemas.direction import DirectionBrief
+from app.schemas.subject import SubjectBrief
 
 class LiteratureBase(BaseModel):
     title: str
@@ -44,3 +46,10 @@ class LiteratureOut(LiteratureBase):
 
     class Config:
         from_attributes = True
+
+class LiteratureSubject(SubjectBrief):
+    directions: List[DirectionBrief] = []
+
+# GET /literatures/: Literature.subject и Subject.directions подгружаются загрузчиками
+class LiteratureWithSubject(LiteratureOut):
+    subject: Optional[LiteratureSubject] = None
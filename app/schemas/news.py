@@ -1,6 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, computed_field
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from app.schemas.tag import TagOut
 
@@ -21,10 +21,27 @@ class NewsUpdate(BaseModel):
     img: Optional[str] = None
     tags: Optional[List[str]] = None
 
+class ImageVariant(BaseModel):
+    path: str
+    format: str
+    width: int
+    bytes: int
+
 class NewsOut(NewsBase):
     id: int
     date: datetime
     university_id: int
+    tags: List[TagOut] = []
+    img_variants: Optional[List[ImageVariant]] = None
+
+    @computed_field
+    @property
+    def img_srcset(self) -> Dict[str, str]:
+        """{"webp": "uploads/news/x-320.webp 320w, ...", "jpeg": ...} — для <picture>/srcset."""
+        srcset: Dict[str, List[str]] = {}
+        for variant in self.img_variants or []:
+            srcset.setdefault(variant.format, []).append(f"{variant.path} {variant.width}w")
+        return {fmt: ", ".join(items) for fmt, items in srcset.items()}
 
     class Config:
         from_attributes = True
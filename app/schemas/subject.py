@@ -15,6 +15,14 @@ class SubjectUpdate(BaseModel):
     direction_ids: Optional[List[int]] = None
     university_id: Optional[int] = None
 
+class SubjectBrief(BaseModel):
+    id: int
+    name: str
+    kafedra_id: int
+
+    class Config:
+        from_attributes = True
+
 class SubjectOut(SubjectBase):
     id: int
     university_id: int
@@ -22,3 +30,24 @@ class SubjectOut(SubjectBase):
 
     class Config:
         from_attributes = True
+
+class SubjectCoverage(BaseModel):
+    id: int
+    name: str
+    kafedra_id: int
+    university_id: int
+    literature_count: int
+    printed_total: int
+    has_electronic: bool
+    # худший % обеспеченности среди направлений предмета (как Available_percent в экспорте);
+    # None — предмет не привязан ни к одному направлению
+    min_available_percent: Optional[int] = None
+
+class SubjectRelink(BaseModel):
+    subject_ids: List[int]
+    add_direction_ids: List[int] = []
+    remove_direction_ids: List[int] = []
+
+class SubjectRelinkResult(BaseModel):
+    added: int
+    removed: int
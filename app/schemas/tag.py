@@ -7,3 +7,6 @@ class TagOut(TagBase):
     id: int
     class Config:
         from_attributes = True
+
+class TagCount(TagOut):
+    count: int
@@ -1,6 +1,6 @@
 # schemas/university.py
 from pydantic import BaseModel, EmailStr
-from typing import Optional
+from typing import List, Optional
 
 class UniversityBase(BaseModel):
     name: str
@@ -26,3 +26,29 @@ class UniversityOut(UniversityBase):
 
     class Config:
         from_attributes = True
+
+
+# ---- Дерево университета (/universities/{id}/tree) ----
+class TreeDirection(BaseModel):
+    id: int
+    number: str
+    name: str
+    course: int
+    student_count: int
+
+class TreeSubject(BaseModel):
+    id: int
+    name: str
+    direction_ids: List[int] = []
+    literature_count: int = 0
+
+class TreeKafedra(BaseModel):
+    id: int
+    name: str
+    subjects: List[TreeSubject] = []
+
+class UniversityTree(BaseModel):
+    id: int
+    name: str
+    directions: List[TreeDirection]
+    kafedras: List[TreeKafedra]
@@ -47,3 +47,15 @@ class UserRead(UserBase):
 
     class Config:
         from_attributes = True
+
+class UserListItem(BaseModel):
+    id: int
+    email: str
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    role: str
+    is_active: Optional[bool] = None
+    university_id: Optional[int] = None
+
+    class Config:
+        from_attributes = True
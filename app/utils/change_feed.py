@@ -0,0 +1,171 @@
+import asyncio
+import json
+import logging
+
+from app.core.config import settings
+from app.core.metrics import Gauge
+from app.core.redis import get_redis
+from app.utils.response_cache import bump_versions
+
+logger = logging.getLogger("app.events")
+
+CHANNEL = "change_feed"
+
+
+class Subscriber:
+    """Одно SSE-соединение: ограниченная очередь событий. Простаивающий клиент —
+    это только ожидающая корутина и пустая очередь."""
+
+    __slots__ = ("university_id", "queue", "overflowed")
+
+    def __init__(self, university_id: int | None):
+        self.university_id = university_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=settings.CHANGE_FEED_QUEUE_SIZE)
+        self.overflowed = False
+
+
+class ChangeBroker:
+    """Раздача событий подписчикам процесса: university_id -> подписчики (None — все университеты)."""
+
+    def __init__(self):
+        self._subscribers: dict[int | None, set[Subscriber]] = {}
+        self.count = 0
+
+    def subscribe(self, university_id: int | None) -> Subscriber:
+        subscriber = Subscriber(university_id)
+        self._subscribers.setdefault(university_id, set()).add(subscriber)
+        self.count += 1
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        group = self._subscribers.get(subscriber.university_id)
+        if group and subscriber in group:
+            group.discard(subscriber)
+            self.count -= 1
+            if not group:
+                del self._subscribers[subscriber.university_id]
+
+    def deliver(self, event: dict) -> None:
+        targets = [*self._subscribers.get(event.get("university_id"), ()), *self._subscribers.get(None, ())]
+        for subscriber in targets:
+            try:
+                subscriber.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # медленный клиент: события теряются, клиенту придёт resync
+                subscriber.overflowed = True
+
+
+broker = ChangeBroker()
+
+SUBSCRIBERS = Gauge(
+    "change_feed_subscribers", "Open change feed (SSE) connections in this process",
+    collect=lambda: [({}, broker.count)],
+)
+
+
+# ======================
+# Backend'ы публикации
+# ======================
+class MemoryChangeBackend:
+    """Один процесс: событие сразу уходит подписчикам этого воркера."""
+
+    async def publish(self, event: dict) -> None:
+        broker.deliver(event)
+
+    async def start(self) -> None:
+        pass
+
+
+class RedisChangeBackend:
+    """Несколько воркеров: публикация в Redis pub/sub, один слушатель на процесс."""
+
+    def __init__(self, channel: str = CHANNEL):
+        self.channel = channel
+        self._listener: asyncio.Task | None = None
+
+    async def publish(self, event: dict) -> None:
+        await get_redis().publish(self.channel, json.dumps(event))
+
+    async def start(self) -> None:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.get_running_loop().create_task(self._listen())
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                pubsub = get_redis().pubsub()
+                await pubsub.subscribe(self.channel)
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        broker.deliver(json.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Change feed listener failed, reconnecting")
+                await asyncio.sleep(1)
+
+
+_backends = {
+    "memory": MemoryChangeBackend,
+    "redis": RedisChangeBackend,
+}
+_backend = None
+
+
+def get_change_backend():
+    global _backend
+    if _backend is None:
+        try:
+            _backend = _backends[settings.CHANGE_FEED_BACKEND]()
+        except KeyError:
+            raise RuntimeError(f"Unknown CHANGE_FEED_BACKEND: {settings.CHANGE_FEED_BACKEND}")
+    return _backend
+
+
+async def emit_change(entity: str, id: int, university_id: int | None, op: str,
+                      previous_university_id: int | None = None) -> None:
+    """Вызывается обработчиками после commit: сбрасывает кэш ответов по entity и
+    рассылает {entity, id, university_id, op}. previous_university_id — при переносе
+    записи в другой университет (его подписчикам тоже нужно обновиться)."""
+    await bump_versions(entity)
+    backend = get_change_backend()
+    try:
+        await backend.publish({"entity": entity, "id": id, "university_id": university_id, "op": op})
+        if previous_university_id is not None and previous_university_id != university_id:
+            await backend.publish({"entity": entity, "id": id, "university_id": previous_university_id, "op": op})
+    except Exception:
+        # запись уже закоммичена — недоставленное событие не повод отвечать 500
+        logger.exception("Failed to publish %s %s #%s", op, entity, id)
+
+
+def format_sse(event: dict | None = None, name: str | None = None, comment: str | None = None) -> bytes:
+    if comment is not None:
+        return f": {comment}\n\n".encode()
+    lines = []
+    if name:
+        lines.append(f"event: {name}")
+    lines.append(f"data: {json.dumps(event, separators=(',', ':'))}")
+    return ("\n".join(lines) + "\n\n").encode()
+
+
+async def stream(university_id: int | None):
+    """Генератор для StreamingResponse: события + heartbeat (он же выявляет отвалившихся клиентов).
+    Подписка — внутри генератора: клиент, отвалившийся до начала потока, подписчика не оставит."""
+    subscriber = broker.subscribe(university_id)
+    try:
+        yield f"retry: {settings.CHANGE_FEED_RETRY_MS}\n\n".encode()
+        while True:
+            if subscriber.overflowed:
+                subscriber.overflowed = False
+                while not subscriber.queue.empty():
+                    subscriber.queue.get_nowait()
+                yield format_sse({"reason": "overflow"}, name="resync")
+                continue
+            try:
+                event = await asyncio.wait_for(subscriber.queue.get(), settings.CHANGE_FEED_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield format_sse(comment="ping")
+                continue
+            yield format_sse(event, name="change")
+    finally:
+        broker.unsubscribe(subscriber)
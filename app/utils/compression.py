@@ -0,0 +1,206 @@
+import zlib
+
+from anyio import to_thread
+
+from app.core.config import settings
+from app.core.metrics import Counter
+
+# brotli / zstandard — опциональные зависимости; без них остаётся gzip
+try:
+    import brotli
+except ImportError:
+    brotli = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Уже сжатые форматы: повторное сжатие тратит CPU и почти ничего не экономит (XLSX — это zip)
+SKIP_MEDIA_TYPES = (
+    "image/", "video/", "audio/", "font/woff",
+    "application/zip", "application/gzip", "application/x-7z-compressed", "application/x-rar",
+    "application/pdf", "application/octet-stream",
+    "application/vnd.openxmlformats-officedocument.",
+    # SSE: тысячи долгоживущих потоков × состояние компрессора на каждый — дорого по памяти
+    "text/event-stream",
+)
+THREAD_THRESHOLD = 1024 * 1024  # большие куски сжимаем вне event loop
+
+COMPRESSION_BYTES = Counter(
+    "response_compression_bytes_total", "Response bytes before/after compression",
+    ("encoding", "stage"),
+)
+
+
+# ======================
+# Кодеки
+# ======================
+class _GzipCodec:
+    def __init__(self, level: int):
+        self._obj = zlib.compressobj(level, zlib.DEFLATED, 31)  # 31 — gzip-обёртка
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data) + self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._obj.compress(data) + self._obj.flush(zlib.Z_FINISH)
+
+
+class _BrotliCodec:
+    def __init__(self, level: int):
+        self._obj = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.process(data) + self._obj.flush()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._obj.process(data) + self._obj.finish()
+
+
+class _ZstdCodec:
+    def __init__(self, level: int):
+        self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data) + self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._obj.compress(data) + self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+def available_codecs() -> dict:
+    """encoding -> (класс кодека, уровень из настроек), в порядке предпочтения сервера."""
+    codecs = {}
+    if zstandard is not None:
+        codecs["zstd"] = (_ZstdCodec, settings.COMPRESSION_ZSTD_LEVEL)
+    if brotli is not None:
+        codecs["br"] = (_BrotliCodec, settings.COMPRESSION_BROTLI_QUALITY)
+    codecs["gzip"] = (_GzipCodec, settings.COMPRESSION_GZIP_LEVEL)
+    return codecs
+
+
+def negotiate(accept_encoding: str, codecs: dict) -> str | None:
+    """Выбирает кодировку по Accept-Encoding (q-значения), при равенстве — порядок codecs."""
+    accepted: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+
+    best, best_q = None, 0.0
+    for encoding in codecs:
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def _compressible(headers: dict) -> bool:
+    if b"content-encoding" in headers:
+        return False
+    content_type = headers.get(b"content-type", b"").decode("latin-1").lower()
+    return not content_type.startswith(SKIP_MEDIA_TYPES)
+
+
+def _add_vary(headers: list) -> list:
+    """Vary: Accept-Encoding (к уже имеющемуся Vary): кэши не должны отдать сжатое тело
+    клиенту без поддержки сжатия и наоборот — на любом ответе маршрута, который бывает сжат."""
+    vary = [v for k, v in headers if k == b"vary"]
+    if any(b"accept-encoding" in v.lower() for v in vary):
+        return headers
+    return [*((k, v) for k, v in headers if k != b"vary"), (b"vary", b", ".join([*vary, b"Accept-Encoding"]))]
+
+
+async def _run(func, data: bytes) -> bytes:
+    if len(data) >= THREAD_THRESHOLD:
+        return await to_thread.run_sync(func, data)
+    return func(data)
+
+
+# ======================
+# Middleware
+# ======================
+class CompressionMiddleware:
+    """gzip/br/zstd по Accept-Encoding. Тело меньше COMPRESSION_MIN_SIZE и сжатые
+    форматы отдаются как есть; потоковые ответы сжимаются по кускам (с flush)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.COMPRESSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+        codecs = available_codecs()
+        encoding = negotiate(accept_encoding, codecs) if accept_encoding and scope["method"] != "HEAD" else None
+        if encoding is None:
+            # не сжимаем, но ответ всё равно зависит от Accept-Encoding
+            async def vary_only(message):
+                if message["type"] == "http.response.start" and _compressible(dict(message.get("headers", []))):
+                    message = {**message, "headers": _add_vary(message.get("headers", []))}
+                await send(message)
+
+            await self.app(scope, receive, vary_only)
+            return
+
+        start: dict | None = None
+        codec = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start, codec, passthrough
+            if message["type"] == "http.response.start":
+                headers = dict(message.get("headers", []))
+                if not _compressible(headers):
+                    passthrough = True
+                    await send(message)
+                    return
+                message = {**message, "headers": _add_vary(message.get("headers", []))}
+                if message["status"] in (204, 304):
+                    passthrough = True
+                    await send(message)
+                else:
+                    # заголовки отправим, когда станет понятно, сжимаем ли тело
+                    start = message
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if start is not None:
+                headers = start.get("headers", [])
+                if not more_body and len(body) < settings.COMPRESSION_MIN_SIZE:
+                    passthrough = True
+                    await send({**start, "headers": headers})
+                    start = None
+                    await send(message)
+                    return
+
+                codec_cls, level = codecs[encoding]
+                codec = codec_cls(level)
+                headers = [(k, v) for k, v in headers if k != b"content-length"]
+                headers.append((b"content-encoding", encoding.encode()))
+                # сжатое тело побайтно другое: сильный ETag становится слабым
+                headers = [(k, b"W/" + v if k == b"etag" and not v.startswith(b"W/") else v) for k, v in headers]
+                await send({**start, "headers": headers})
+                start = None
+
+            compressed = await _run(codec.compress if more_body else codec.finish, body)
+            COMPRESSION_BYTES.inc(len(body), encoding=encoding, stage="raw")
+            COMPRESSION_BYTES.inc(len(compressed), encoding=encoding, stage="compressed")
+            await send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,91 @@
+# Замер стоимости профилей хеширования на текущем железе:
+#   python -m app.utils.hash_benchmark --seconds 3 --bcrypt-rounds 10,11,12,13
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from app.utils.security import HASH_PROFILES, build_crypt_context
+
+
+def _context_for(label: str):
+    # "bcrypt-<rounds>" — разовый профиль для сравнения разных cost
+    if label.startswith("bcrypt-"):
+        rounds = int(label.split("-", 1)[1])
+        HASH_PROFILES[label] = {
+            "scheme": "bcrypt",
+            "bcrypt__default_rounds": rounds,
+            "bcrypt__min_rounds": rounds,
+            "bcrypt__max_rounds": rounds,
+        }
+    return build_crypt_context(label)
+
+
+def _hash_for(label: str, seconds: float) -> tuple[int, float]:
+    """Хеширует в одном процессе (= одно ядро) не меньше seconds секунд."""
+    context = _context_for(label)
+    context.hash("warm-up")
+    count = 0
+    started = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < seconds:
+        context.hash(f"benchmark-password-{count}")
+        count += 1
+        elapsed = time.perf_counter() - started
+    return count, elapsed
+
+
+def benchmark(label: str, seconds: float, workers: int) -> dict:
+    count, elapsed = _hash_for(label, seconds)
+    result = {
+        "profile": label,
+        "hash_ms": round(elapsed / count * 1000, 2),
+        "hashes_per_sec_per_core": round(count / elapsed, 2),
+    }
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            runs = list(pool.map(_hash_for, [label] * workers, [seconds] * workers))
+        total = sum(c / e for c, e in runs)
+        result["workers"] = workers
+        result["hashes_per_sec_total"] = round(total, 2)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark password hashing profiles")
+    parser.add_argument("--profiles", default=",".join(HASH_PROFILES),
+                        help="comma separated profile names")
+    parser.add_argument("--bcrypt-rounds", default="",
+                        help="extra bcrypt cost values to compare, e.g. 10,11,12")
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="parallel processes for the total throughput run")
+    parser.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    args = parser.parse_args()
+
+    labels = [p for p in args.profiles.split(",") if p]
+    labels += [f"bcrypt-{int(r)}" for r in args.bcrypt_rounds.split(",") if r]
+
+    results = []
+    for label in labels:
+        try:
+            results.append(benchmark(label, args.seconds, args.workers))
+        except RuntimeError as exc:  # например, нет argon2-cffi
+            results.append({"profile": label, "error": str(exc)})
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'profile':<12} {'ms/hash':>10} {'hash/s/core':>12} {'hash/s total':>13}")
+    for r in results:
+        if "error" in r:
+            print(f"{r['profile']:<12} {r['error']}")
+            continue
+        print(f"{r['profile']:<12} {r['hash_ms']:>10} {r['hashes_per_sec_per_core']:>12} "
+              f"{r.get('hashes_per_sec_total', '-'):>13}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+import asyncio
+import logging
+import os
+import uuid
+from pathlib import Path
+
+from anyio import to_thread
+from fastapi import UploadFile
+from sqlalchemy import select, update
+
+from app.core.config import settings
+from app.core.metrics import Counter, UPLOAD_BYTES
+from app.db.session import AsyncSessionLocal
+from app.models.news import News
+from app.utils.change_feed import emit_change
+
+# Pillow — опциональная зависимость; без неё картинка отдаётся как загружена
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
+
+logger = logging.getLogger("app.images")
+
+NEWS_IMAGE_DIR = "uploads/news"
+UPLOAD_CHUNK = 1024 * 1024
+
+# JPEG/PNG/WebP/GIF-источники; остальное сохраняем, но варианты не строим
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".webp", ".gif"}
+
+IMAGE_JOBS = Counter("news_image_jobs_total", "News image processing jobs by result", ("result",))
+VARIANT_BYTES = Counter("news_image_variant_bytes_total", "Bytes of generated news image variants", ("format",))
+
+
+async def save_upload(upload: UploadFile, directory: str = NEWS_IMAGE_DIR) -> str:
+    """Пишет загрузку на диск кусками под уникальным именем, возвращает путь."""
+    suffix = Path(upload.filename or "").suffix.lower()
+    os.makedirs(directory, exist_ok=True)
+    path = f"{directory}/{uuid.uuid4().hex}{suffix}"
+    size = 0
+    with open(path, "wb") as buffer:
+        while chunk := await upload.read(UPLOAD_CHUNK):
+            buffer.write(chunk)
+            size += len(chunk)
+    UPLOAD_BYTES.inc(size, kind="news_image")
+    return path
+
+
+# ======================
+# Обработка (в потоке: Pillow держит CPU)
+# ======================
+def _process(path: str) -> list[dict]:
+    """Убирает метаданные из оригинала и строит WebP/JPEG по ширинам NEWS_IMAGE_WIDTHS."""
+    source = Path(path)
+    with Image.open(source) as original:
+        original.load()  # оригинал будет перезаписан — данные читаем заранее
+        rotated = original.getexif().get(0x0112, 1) != 1
+        image = ImageOps.exif_transpose(original)  # ориентация из EXIF — до того, как EXIF выбросим
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+
+        # EXIF/XMP (GPS, модель камеры): пересохраняем оригинал без них — Pillow пишет
+        # метаданные, только если их передать явно. JPEG — по возможности с его же таблицами
+        # квантования (без потери качества), PNG — без потерь; GIF EXIF не несёт
+        if original.format == "JPEG":
+            if rotated:
+                image.convert("RGB").save(source, "JPEG", quality=95, optimize=True)
+            else:
+                original.save(source, "JPEG", quality="keep", optimize=True)
+        elif original.format == "PNG":
+            (image if rotated else original).save(source, "PNG", optimize=True)
+        elif original.format == "WEBP":
+            image.save(source, "WEBP", quality=95, method=4)
+
+        widths = sorted({w for w in settings.NEWS_IMAGE_WIDTHS if w < image.width} | {
+            min(image.width, max(settings.NEWS_IMAGE_WIDTHS))
+        })
+        variants = []
+        for width in widths:
+            height = max(1, round(image.height * width / image.width))
+            resized = image.resize((width, height), Image.LANCZOS) if width != image.width else image
+            for fmt, ext, options in (
+                ("webp", "webp", {"quality": settings.NEWS_IMAGE_WEBP_QUALITY, "method": 4}),
+                ("jpeg", "jpg", {"quality": settings.NEWS_IMAGE_JPEG_QUALITY, "optimize": True, "progressive": True}),
+            ):
+                target = source.with_name(f"{source.stem}-{width}.{ext}")
+                frame = resized.convert("RGB") if fmt == "jpeg" else resized
+                frame.save(target, fmt.upper(), **options)
+                size = target.stat().st_size
+                VARIANT_BYTES.inc(size, format=fmt)
+                variants.append({"path": target.as_posix(), "format": fmt, "width": width, "bytes": size})
+    return variants
+
+
+# ======================
+# Очередь и воркер
+# ======================
+class ImagePipeline:
+    """Фоновая обработка картинок новостей в процессе: ограниченная очередь и один воркер.
+    Результат пишется в News.img_variants, только если картинку за это время не заменили."""
+
+    def __init__(self):
+        self._queue: asyncio.Queue | None = None
+        self._worker: asyncio.Task | None = None
+        self._backfill: asyncio.Task | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return Image is not None and settings.NEWS_IMAGE_PROCESSING
+
+    def _accepts(self, path: str) -> bool:
+        return self.enabled and Path(path).suffix.lower() in IMAGE_SUFFIXES
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue(maxsize=settings.NEWS_IMAGE_QUEUE_SIZE)
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    def enqueue(self, news_id: int, path: str) -> None:
+        if not self._accepts(path):
+            return
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait((news_id, path))
+        except asyncio.QueueFull:
+            # картинка уже сохранена и доступна как есть — варианты просто не появятся
+            IMAGE_JOBS.inc(result="dropped")
+            logger.warning("Image queue is full, skipping variants for news #%s", news_id)
+
+    def start_backfill(self) -> None:
+        """При старте: новости с картинкой, но без вариантов (процесс упал/перезапущен
+        до обработки), снова ставятся в очередь — в фоне, не задерживая старт."""
+        if self.enabled and self._backfill is None:
+            self._backfill = asyncio.get_running_loop().create_task(self._run_backfill())
+
+    async def _run_backfill(self) -> None:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(News.id, News.img)
+                .where(News.img.is_not(None), News.img_variants.is_(None))
+                .order_by(News.id)
+            )
+            pending = result.all()
+        for news_id, path in pending:
+            if self._accepts(path) and Path(path).exists():
+                self._ensure_worker()
+                await self._queue.put((news_id, path))  # ждём места, а не отбрасываем
+        if pending:
+            logger.info("Queued %d news images without variants", len(pending))
+
+    async def join(self) -> None:
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def close(self, timeout: float) -> None:
+        """При остановке: дать очереди доработать не дольше timeout, затем отменить воркер."""
+        if self._backfill is not None:
+            self._backfill.cancel()
+        if self._worker is not None and not self._worker.done():
+            try:
+                await asyncio.wait_for(self.join(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning("Image queue not drained on shutdown, %d jobs left", self._queue.qsize())
+            self._worker.cancel()
+        for task in (self._backfill, self._worker):
+            if task is not None:
+                await asyncio.gather(task, return_exceptions=True)
+        self._backfill = self._worker = self._queue = None
+
+    async def _run(self) -> None:
+        while True:
+            news_id, path = await self._queue.get()
+            try:
+                await self._handle(news_id, path)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                IMAGE_JOBS.inc(result="failed")
+                logger.exception("Failed to process image %s for news #%s", path, news_id)
+            finally:
+                self._queue.task_done()
+
+    async def _handle(self, news_id: int, path: str) -> None:
+        variants = await to_thread.run_sync(_process, path)
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                update(News)
+                .where(News.id == news_id, News.img == path)
+                .values(img_variants=variants)
+                .returning(News.university_id)
+            )
+            university_id = result.scalar()
+            await db.commit()
+        if university_id is None:
+            # новость удалена или картинку заменили — варианты никому не нужны
+            IMAGE_JOBS.inc(result="stale")
+            for variant in variants:
+                Path(variant["path"]).unlink(missing_ok=True)
+            return
+        IMAGE_JOBS.inc(result="done")
+        await emit_change("news", news_id, university_id, "update")
+
+
+image_pipeline = ImagePipeline()
@@ -0,0 +1,194 @@
+import math
+import time
+from collections import OrderedDict
+
+from fastapi import HTTPException, Request, status
+
+from app.core.config import settings
+from app.core.metrics import Counter
+from app.core.redis import get_redis
+
+RATE_LIMIT_REJECTED = Counter(
+    "rate_limit_rejected_total", "Requests rejected with 429 since process start", ("limiter",),
+)
+
+
+# ======================
+# Backend'ы token bucket
+# ======================
+class MemoryRateLimitBackend:
+    """Bucket'ы в памяти процесса: key -> [tokens, updated_at, capacity, refill_per_sec]."""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, list[float]]" = OrderedDict()
+
+    async def consume(self, key: str, capacity: float, refill_per_sec: float, cost: float = 1.0) -> float:
+        """Списывает cost токенов. Возвращает 0, если запрос пропущен, иначе сколько секунд ждать."""
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            tokens = capacity
+        else:
+            tokens = min(capacity, bucket[0] + (now - bucket[1]) * refill_per_sec)
+            self._buckets.move_to_end(key)
+
+        retry_after = 0.0
+        if tokens >= cost:
+            tokens -= cost
+        else:
+            retry_after = (cost - tokens) / refill_per_sec
+        self._buckets[key] = [tokens, now, capacity, refill_per_sec]
+
+        # старые ключи вытесняем — память ограничена даже при переборе IP/email
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return retry_after
+
+    async def occupancy(self, names: list[str]) -> dict[str, dict]:
+        """Один проход по bucket'ам для всех limiter'ов: name -> active/depleted/avg_fill."""
+        now = time.monotonic()
+        totals = {name: [0, 0, 0.0] for name in names}  # name -> [active, depleted, used]
+        for key in list(self._buckets):
+            tokens, updated_at, capacity, refill = self._buckets[key]
+            tokens = min(capacity, tokens + (now - updated_at) * refill)
+            if tokens >= capacity:
+                # полностью восстановленный bucket ничем не отличается от отсутствующего
+                del self._buckets[key]
+                continue
+            total = totals.get(key.partition(":")[0])  # ключ bucket'а — "name:key"
+            if total is None:
+                continue
+            total[0] += 1
+            total[2] += (capacity - tokens) / capacity
+            if tokens < 1:
+                total[1] += 1
+        return {
+            name: {
+                "active_buckets": active,
+                "depleted_buckets": depleted,
+                "avg_fill": round(used / active, 4) if active else 0.0,
+            }
+            for name, (active, depleted, used) in totals.items()
+        }
+
+
+# Атомарное списание в Redis: состояние bucket'а общее для всех воркеров
+_REDIS_TOKEN_BUCKET = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 't', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local retry = 0
+if tokens >= cost then
+    tokens = tokens - cost
+else
+    retry = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 't', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(retry)
+"""
+
+
+class RedisRateLimitBackend:
+    def __init__(self, key_prefix: str = "ratelimit:"):
+        self.key_prefix = key_prefix
+        self._script = None
+
+    async def consume(self, key: str, capacity: float, refill_per_sec: float, cost: float = 1.0) -> float:
+        if self._script is None:
+            self._script = get_redis().register_script(_REDIS_TOKEN_BUCKET)
+        retry_after = await self._script(
+            keys=[self.key_prefix + key],
+            args=[capacity, refill_per_sec, time.time(), cost],
+        )
+        return float(retry_after)
+
+    async def occupancy(self, names: list[str]) -> dict[str, dict]:
+        # обход ключей в Redis дорогой — наружу отдаём только счётчики процесса
+        return {}
+
+
+_backends = {
+    "memory": lambda: MemoryRateLimitBackend(settings.RATE_LIMIT_MAX_KEYS),
+    "redis": RedisRateLimitBackend,
+}
+_backend = None
+
+
+def get_rate_limit_backend():
+    global _backend
+    if _backend is None:
+        try:
+            _backend = _backends[settings.RATE_LIMIT_BACKEND]()
+        except KeyError:
+            raise RuntimeError(f"Unknown RATE_LIMIT_BACKEND: {settings.RATE_LIMIT_BACKEND}")
+    return _backend
+
+
+def set_rate_limit_backend(backend) -> None:
+    """Подменяет backend (любой объект с consume()/occupancy())."""
+    global _backend
+    _backend = backend
+
+
+# ======================
+# Limiter
+# ======================
+limiters: list["RateLimiter"] = []
+
+
+class RateLimiter:
+    def __init__(self, name: str, burst: int, per_minute: int):
+        self.name = name
+        self.capacity = float(burst)
+        self.refill_per_sec = per_minute / 60
+        self.allowed = 0
+        self.rejected = 0
+        limiters.append(self)
+
+    async def hit(self, key: str) -> None:
+        """Бросает 429 до любой работы с БД/bcrypt, если bucket ключа пуст."""
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        retry_after = await get_rate_limit_backend().consume(
+            f"{self.name}:{key}", self.capacity, self.refill_per_sec
+        )
+        if retry_after > 0:
+            self.rejected += 1
+            RATE_LIMIT_REJECTED.inc(limiter=self.name)
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many attempts, try again later",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+        self.allowed += 1
+
+    def stats(self, occupancy: dict) -> dict:
+        """occupancy — результат backend.occupancy(): один обход на все limiter'ы."""
+        return {
+            "name": self.name,
+            "capacity": self.capacity,
+            "refill_per_sec": round(self.refill_per_sec, 4),
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+            **occupancy.get(self.name, {}),
+        }
+
+
+async def limiter_stats() -> list[dict]:
+    occupancy = await get_rate_limit_backend().occupancy([limiter.name for limiter in limiters])
+    return [limiter.stats(occupancy) for limiter in limiters]
+
+
+def client_ip(request: Request) -> str:
+    if settings.RATE_LIMIT_TRUST_PROXY:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
@@ -0,0 +1,264 @@
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qsl, urlencode
+
+from app.core.config import settings
+from app.core.metrics import Counter
+from app.core.redis import get_redis
+from app.db.session import ReplicaSessions
+
+# Публичные GET: шаблон пути -> сущности, от версий которых зависит ответ.
+# universities входит везде: удаление университета каскадно удаляет всё остальное.
+CACHED_ENDPOINTS = [
+    (re.compile(r"/universities/"), ("universities",)),
+    (re.compile(r"/directions/"), ("directions", "subjects", "universities")),
+    (re.compile(r"/kafedras/"), ("kafedras", "universities")),
+    (re.compile(r"/subjects/"), ("subjects", "directions", "kafedras", "universities")),
+    (re.compile(r"/news/"), ("news", "universities")),
+    (re.compile(r"/news/tags/top"), ("news", "universities")),
+    (re.compile(r"/news/search"), ("news", "universities")),
+    (re.compile(r"/universities/\d+/tree"), ("universities", "directions", "kafedras", "subjects", "literature")),
+]
+
+
+# Заголовки ответа, которые сохраняются вместе с телом (курсор пагинации — часть ответа)
+STORED_HEADERS = (b"content-type", b"x-next-cursor")
+
+
+def _cached_endpoint(path: str) -> tuple | None:
+    """(шаблон, сущности) из CACHED_ENDPOINTS для пути или None."""
+    for pattern, entities in CACHED_ENDPOINTS:
+        if pattern.fullmatch(path):
+            return pattern, entities
+    return None
+
+
+RESPONSE_CACHE = Counter(
+    "response_cache_requests_total", "Cached endpoint requests by outcome (hit/not_modified/miss/bypass)",
+    ("result",),
+)
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+# ======================
+# Backend'ы
+# ======================
+# Версия сущности — метка времени в мс последнего изменения (строго растёт).
+# Поэтому ETag, выданный до рестарта процесса, не совпадёт с новым ETag.
+class MemoryCacheBackend:
+    """Версии и тела ответов в памяти процесса (LRU + TTL)."""
+
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max_entries
+        self._started = _now_ms()
+        self._versions: dict[str, int] = {}
+        self._entries: "OrderedDict[str, tuple[float, str, bytes]]" = OrderedDict()
+
+    async def versions(self, entities: tuple) -> list[int]:
+        return [self._versions.get(e, self._started) for e in entities]
+
+    async def bump(self, entities: tuple) -> None:
+        now = _now_ms()
+        for entity in entities:
+            self._versions[entity] = max(now, self._versions.get(entity, self._started) + 1)
+
+    async def get(self, key: str) -> tuple[list, bytes] | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, headers, body = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return headers, body
+
+    async def set(self, key: str, headers: list, body: bytes, ttl: int) -> None:
+        self._entries[key] = (time.monotonic() + ttl, headers, body)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+# Отсутствующая версия инициализируется текущим временем (SET NX), а не нулём
+_REDIS_VERSIONS = """
+local result = {}
+for i, key in ipairs(KEYS) do
+    redis.call('SET', key, ARGV[1], 'NX')
+    result[i] = redis.call('GET', key)
+end
+return result
+"""
+
+_REDIS_BUMP = """
+for _, key in ipairs(KEYS) do
+    local current = tonumber(redis.call('GET', key) or '0')
+    redis.call('SET', key, math.max(tonumber(ARGV[1]), current + 1))
+end
+return 1
+"""
+
+
+class RedisCacheBackend:
+    """Версии и тела в Redis — общие для всех воркеров; запись в одном видна остальным."""
+
+    def __init__(self, key_prefix: str = "respcache:"):
+        self.key_prefix = key_prefix
+        self._versions_script = None
+        self._bump_script = None
+
+    def _version_keys(self, entities: tuple) -> list[str]:
+        return [f"{self.key_prefix}v:{e}" for e in entities]
+
+    async def versions(self, entities: tuple) -> list[int]:
+        if self._versions_script is None:
+            self._versions_script = get_redis().register_script(_REDIS_VERSIONS)
+        values = await self._versions_script(keys=self._version_keys(entities), args=[_now_ms()])
+        return [int(v) for v in values]
+
+    async def bump(self, entities: tuple) -> None:
+        if self._bump_script is None:
+            self._bump_script = get_redis().register_script(_REDIS_BUMP)
+        await self._bump_script(keys=self._version_keys(entities), args=[_now_ms()])
+
+    async def get(self, key: str) -> tuple[list, bytes] | None:
+        raw = await get_redis().get(f"{self.key_prefix}r:{key}")
+        if raw is None:
+            return None
+        head, _, body = raw.partition(b"\0")
+        headers = [tuple(line.split(b": ", 1)) for line in head.split(b"\r\n") if line]
+        return headers, body
+
+    async def set(self, key: str, headers: list, body: bytes, ttl: int) -> None:
+        head = b"\r\n".join(name + b": " + value for name, value in headers)
+        await get_redis().set(f"{self.key_prefix}r:{key}", head + b"\0" + body, ex=ttl)
+
+
+_backends = {
+    "memory": lambda: MemoryCacheBackend(settings.RESPONSE_CACHE_MAX_ENTRIES),
+    "redis": RedisCacheBackend,
+}
+_backend = None
+
+
+def get_cache_backend():
+    global _backend
+    if _backend is None:
+        try:
+            _backend = _backends[settings.RESPONSE_CACHE_BACKEND]()
+        except KeyError:
+            raise RuntimeError(f"Unknown RESPONSE_CACHE_BACKEND: {settings.RESPONSE_CACHE_BACKEND}")
+    return _backend
+
+
+def set_cache_backend(backend) -> None:
+    """Подменяет backend (любой объект с versions()/bump()/get()/set())."""
+    global _backend
+    _backend = backend
+
+
+async def bump_versions(*entities: str) -> None:
+    """Вызывается обработчиками после commit: все ETag'и, зависящие от entities, устаревают."""
+    if settings.RESPONSE_CACHE_ENABLED:
+        await get_cache_backend().bump(entities)
+
+
+# ======================
+# Middleware
+# ======================
+def _etag(scope, entities: tuple, versions: list[int]) -> str:
+    query = urlencode(sorted(parse_qsl(scope["query_string"].decode("latin-1"), keep_blank_values=True)))
+    stamp = ",".join(f"{e}:{v}" for e, v in zip(entities, versions))
+    digest = hashlib.sha1(f"{scope['path']}?{query}|{stamp}".encode()).hexdigest()[:24]
+    # weak: тело может быть пережато по пути, семантически ответ тот же
+    return f'W/"{digest}"'
+
+
+def _if_none_match(scope) -> list[str]:
+    for name, value in scope["headers"]:
+        if name == b"if-none-match":
+            return [tag.strip() for tag in value.decode("latin-1").split(",")]
+    return []
+
+
+# шаблон из CACHED_ENDPOINTS -> маршрут, запомненный на промахе: при ответе из кэша роутер
+# не вызывается, а MetricsMiddleware берёт шаблон маршрута из scope["route"].
+# Ключ — шаблон, а не сырой путь: словарь не больше CACHED_ENDPOINTS
+_routes: dict = {}
+
+
+class ResponseCacheMiddleware:
+    """ETag + If-None-Match для CACHED_ENDPOINTS. Пока ответ с этим ETag лежит в кэше
+    (RESPONSE_CACHE_TTL): совпадение ETag — 304, иначе тело из кэша; в обоих случаях БД не трогаем."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        endpoint = _cached_endpoint(scope["path"]) if scope["type"] == "http" else None
+        if not endpoint or scope["method"] != "GET" or not settings.RESPONSE_CACHE_ENABLED:
+            await self.app(scope, receive, send)
+            return
+        pattern, entities = endpoint
+
+        backend = get_cache_backend()
+        versions = await backend.versions(entities)
+        # сразу после записи реплика может отставать: такой ответ не кэшируем и ETag не выдаём
+        if ReplicaSessions and _now_ms() - max(versions) < settings.REPLICA_STICKY_SECONDS * 1000:
+            RESPONSE_CACHE.inc(result="bypass")
+            await self.app(scope, receive, send)
+            return
+
+        etag = _etag(scope, entities, versions)
+        headers = [(b"etag", etag.encode()), (b"cache-control", b"no-cache")]
+
+        # запись истекла по TTL (или вытеснена) — ответ строится заново, даже если ETag совпал
+        cached = await backend.get(etag)
+        if cached is not None and (etag in _if_none_match(scope) or "*" in _if_none_match(scope)):
+            RESPONSE_CACHE.inc(result="not_modified")
+            scope.setdefault("route", _routes.get(pattern))
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        if cached is not None:
+            RESPONSE_CACHE.inc(result="hit")
+            stored_headers, body = cached
+            scope.setdefault("route", _routes.get(pattern))
+            await send({"type": "http.response.start", "status": 200, "headers": [
+                *headers,
+                *stored_headers,
+                (b"content-length", str(len(body)).encode()),
+                (b"x-cache", b"HIT"),
+            ]})
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        RESPONSE_CACHE.inc(result="miss")
+        start: dict = {}
+        chunks: list[bytes] = []
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                start.update(message)
+                if message["status"] == 200:
+                    message = {**message, "headers": [*message.get("headers", []), *headers, (b"x-cache", b"MISS")]}
+                await send(message)
+                return
+            await send(message)
+            if message["type"] == "http.response.body" and start.get("status") == 200:
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    response_headers = start.get("headers", [])
+                    if all(name != b"set-cookie" for name, _ in response_headers):
+                        stored_headers = [(k, v) for k, v in response_headers if k in STORED_HEADERS]
+                        await backend.set(etag, stored_headers, b"".join(chunks), settings.RESPONSE_CACHE_TTL)
+
+        await self.app(scope, receive, send_wrapper)
+        if "route" in scope:
+            _routes[pattern] = scope["route"]
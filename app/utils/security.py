@@ -1,13 +1,58 @@
 from datetime import datetime, timedelta
 from jose import jwt
 from passlib.context import CryptContext
+from passlib.hash import argon2
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# ---- Профили хеширования ----
+# Параметры cost у профиля фиксированные (min = max), поэтому хеш со старым
+# cost или другой схемой считается устаревшим и перехешируется при логине.
+HASH_PROFILES = {
+    "bcrypt": {
+        "scheme": "bcrypt",
+        "bcrypt__default_rounds": settings.BCRYPT_ROUNDS,
+        "bcrypt__min_rounds": settings.BCRYPT_ROUNDS,
+        "bcrypt__max_rounds": settings.BCRYPT_ROUNDS,
+    },
+    "argon2id": {
+        "scheme": "argon2",
+        "argon2__type": "ID",
+        "argon2__default_rounds": settings.ARGON2_TIME_COST,
+        "argon2__min_rounds": settings.ARGON2_TIME_COST,
+        "argon2__max_rounds": settings.ARGON2_TIME_COST,
+        "argon2__memory_cost": settings.ARGON2_MEMORY_COST,
+        "argon2__parallelism": settings.ARGON2_PARALLELISM,
+    },
+}
+
+
+def build_crypt_context(profile: str) -> CryptContext:
+    if profile not in HASH_PROFILES:
+        raise ValueError(f"Unknown password hash profile: {profile}")
+    options = dict(HASH_PROFILES[profile])
+    default = options.pop("scheme")
+
+    # argon2-cffi — опциональная зависимость; без неё проверяем только bcrypt
+    schemes = ["bcrypt"]
+    if argon2.has_backend():
+        schemes.append("argon2")
+    elif default == "argon2":
+        raise RuntimeError("argon2id profile requires the 'argon2-cffi' package")
+    else:
+        options = {k: v for k, v in options.items() if not k.startswith("argon2__")}
+
+    return CryptContext(schemes=schemes, default=default, deprecated="auto", **options)
+
+
+pwd_context = build_crypt_context(settings.PASSWORD_HASH_PROFILE)
 
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
+def verify_and_update_password(plain_password, hashed_password):
+    """(verified, new_hash): new_hash не None, если хеш нужно пересохранить под текущий профиль."""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
 def get_password_hash(password):
     return pwd_context.hash(password)
 
@@ -23,4 +68,4 @@ def create_refresh_token(data: dict, expires_delta: timedelta | None = None):
     expire = datetime.utcnow() + timedelta(days=expires_delta or settings.REFRESH_TOKEN_EXPIRE_DAYS)
     to_encode.update({"exp": expire, "type": "refresh"})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
-    return encoded_jwt
\ No newline at end of file
+    return encoded_jwt
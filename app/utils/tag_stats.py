@@ -0,0 +1,84 @@
+from collections import Counter
+
+from sqlalchemy import delete, func, insert, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.upsert import insert_or_add
+from app.models.news import News
+from app.models.tag import Tag, news_tags, tag_stats
+
+GLOBAL = 0  # university_id строки «по всем университетам»
+
+
+async def apply_tag_deltas(db: AsyncSession, university_id: int, added=(), removed=()) -> None:
+    """Сдвигает счётчики тегов университета и глобальные: +1 за added, -1 за removed.
+    Вызывается до commit — в той же транзакции, что и изменение news_tags."""
+    deltas = Counter(added)
+    deltas.subtract(removed)
+    rows = [
+        {"university_id": scope, "tag_id": tag_id, "count": delta}
+        for tag_id, delta in deltas.items() if delta
+        for scope in (university_id, GLOBAL)
+    ]
+    if not rows:
+        return
+    await db.execute(insert_or_add(db, tag_stats, ["university_id", "tag_id"], "count"), rows)
+    if any(row["count"] < 0 for row in rows):
+        await db.execute(delete(tag_stats).where(tag_stats.c.count <= 0))
+
+
+async def news_tag_ids(db: AsyncSession, news_id: int) -> list[int]:
+    result = await db.execute(select(news_tags.c.tag_id).where(news_tags.c.news_id == news_id))
+    return result.scalars().all()
+
+
+async def drop_university(db: AsyncSession, university_id: int) -> None:
+    """Перед каскадным удалением университета: вычесть его счётчики из глобальных."""
+    own = tag_stats.alias("own")
+    await db.execute(
+        update(tag_stats)
+        .where(tag_stats.c.university_id == GLOBAL)
+        .where(tag_stats.c.tag_id.in_(select(own.c.tag_id).where(own.c.university_id == university_id)))
+        .values(count=tag_stats.c.count - (
+            select(own.c.count)
+            .where(own.c.university_id == university_id, own.c.tag_id == tag_stats.c.tag_id)
+            .scalar_subquery()
+        ))
+    )
+    await db.execute(
+        delete(tag_stats).where((tag_stats.c.university_id == university_id) | (tag_stats.c.count <= 0))
+    )
+
+
+def top_tags_query(university_id: int, limit: int):
+    return (
+        select(Tag.id, Tag.name, tag_stats.c.count)
+        .join(Tag, Tag.id == tag_stats.c.tag_id)
+        .where(tag_stats.c.university_id == university_id)
+        .order_by(tag_stats.c.count.desc(), Tag.id)
+        .limit(limit)
+    )
+
+
+async def top_tags(db: AsyncSession, university_id: int, limit: int) -> list:
+    result = await db.execute(top_tags_query(university_id, limit))
+    return result.all()
+
+
+def rebuild_statements() -> list:
+    """Пересчёт tag_stats с нуля по news_tags (после массовой загрузки данных в обход API)."""
+    per_university = (
+        select(News.university_id, news_tags.c.tag_id, func.count())
+        .join(News, News.id == news_tags.c.news_id)
+        .group_by(News.university_id, news_tags.c.tag_id)
+    )
+    overall = (
+        select(literal(GLOBAL), news_tags.c.tag_id, func.count())
+        .group_by(news_tags.c.tag_id)
+    )
+    columns = ["university_id", "tag_id", "count"]
+    return [
+        delete(tag_stats),
+        insert(tag_stats).from_select(columns, per_university),
+        insert(tag_stats).from_select(columns, overall),
+    ]
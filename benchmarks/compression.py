@@ -0,0 +1,105 @@
+# Сколько байт экономит и сколько CPU стоит каждый кодек/уровень на реальных ответах API:
+#   python -m benchmarks.compression --subjects 500 --output compression.json
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.datagen import OWNER_EMAIL, OWNER_PASSWORD, add_size_arguments, size_from_args
+
+PAYLOADS = ["/literatures/", "/subjects/", "/news/", "/statistics/export"]
+LEVELS = {
+    "gzip": (1, 3, 6, 9),
+    "br": (1, 4, 6, 9, 11),
+    "zstd": (1, 3, 6, 12, 19),
+}
+
+
+async def fetch_payloads(args) -> dict[str, bytes]:
+    import httpx
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from benchmarks.datagen import prepare_schema, generate
+    from app.main import app
+
+    engine = create_async_engine(os.environ["DATABASE_URL"])
+    await prepare_schema(engine)
+    await generate(engine, size_from_args(args), seed=args.seed)
+    await engine.dispose()
+
+    payloads = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench",
+                                 headers={"Accept-Encoding": "identity"}) as client:
+        (await client.post("/auth/login", json={"email": OWNER_EMAIL, "password": OWNER_PASSWORD})).raise_for_status()
+        for path in PAYLOADS:
+            response = await client.get(path)
+            response.raise_for_status()
+            payloads[path] = response.content
+    return payloads
+
+
+def measure(codec_cls, level: int, body: bytes, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        started = time.process_time()
+        compressed = codec_cls(level).finish(body)
+        timings.append(time.process_time() - started)
+    cpu_ms = statistics.median(timings) * 1000
+    return {
+        "level": level,
+        "bytes": len(compressed),
+        "ratio": round(len(body) / len(compressed), 2),
+        "saved_pct": round((1 - len(compressed) / len(body)) * 100, 1),
+        "cpu_ms": round(cpu_ms, 3),
+        "mb_per_s": round(len(body) / 1e6 / (cpu_ms / 1000), 1) if cpu_ms else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bytes saved vs CPU spent per codec and level")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write the JSON report to this file")
+    add_size_arguments(parser)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ.setdefault("SECRET_KEY", "bench")
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{tmp}/bench.db"
+        os.environ["RATE_LIMIT_ENABLED"] = "false"
+        payloads = asyncio.run(fetch_payloads(args))
+
+    from app.utils.compression import _GzipCodec, _BrotliCodec, _ZstdCodec, brotli, zstandard
+    codecs = {"gzip": _GzipCodec}
+    if brotli is not None:
+        codecs["br"] = _BrotliCodec
+    if zstandard is not None:
+        codecs["zstd"] = _ZstdCodec
+    missing = sorted(set(LEVELS) - set(codecs))
+    if missing:
+        print(f"skipped (package not installed): {', '.join(missing)}", file=sys.stderr)
+
+    report = {}
+    for path, body in payloads.items():
+        report[path] = {"raw_bytes": len(body), "codecs": {}}
+        print(f"\n{path}  {len(body)} bytes", file=sys.stderr)
+        for name, codec_cls in codecs.items():
+            rows = [measure(codec_cls, level, body, args.repeat) for level in LEVELS[name]]
+            report[path]["codecs"][name] = rows
+            for row in rows:
+                print(f"  {name:<5} level={row['level']:<3} {row['bytes']:>10} B  saved {row['saved_pct']:>5}%  "
+                      f"{row['cpu_ms']:>9} ms  {row['mb_per_s']} MB/s", file=sys.stderr)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+# Детерминированный генератор синтетических данных для бенчмарков:
+#   python -m benchmarks.datagen --url sqlite+aiosqlite:///./bench.db --universities 5 --subjects 500
+import argparse
+import asyncio
+import random
+from dataclasses import dataclass, asdict, fields
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine
+
+# app.* импортируются внутри функций: настройки (DATABASE_URL) читаются при импорте,
+# а benchmarks.run выставляет окружение уже после импорта этого модуля
+
+OWNER_EMAIL = "bench-owner@example.com"
+OWNER_PASSWORD = "bench-password"
+
+
+@dataclass
+class DatasetSize:
+    universities: int = 3
+    directions: int = 20  # на университет
+    kafedras: int = 10  # на университет
+    subjects: int = 200  # на университет
+    directions_per_subject: int = 3
+    literature: int = 4  # на предмет
+    news: int = 200  # на университет
+    tags: int = 50
+    tags_per_news: int = 3
+
+
+async def prepare_schema(engine: AsyncEngine) -> None:
+    """Схема как после `alembic upgrade head` (create_all + отметка ревизии)."""
+    from app.db.session import Base
+    from app.db.migrations import expected_revision
+    import app.models  # noqa: F401
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(text("CREATE TABLE IF NOT EXISTS alembic_version (version_num VARCHAR(32) NOT NULL PRIMARY KEY)"))
+        await conn.execute(text("DELETE FROM alembic_version"))
+        await conn.execute(text("INSERT INTO alembic_version VALUES (:rev)"), {"rev": expected_revision()})
+
+
+async def generate(engine: AsyncEngine, size: DatasetSize, seed: int = 42, batch: int = 5000) -> dict:
+    """Заполняет пустую БД; одинаковые size + seed дают одинаковые данные."""
+    from app.models import Admin, University, Direction, Kafedra, Subject, Literature, News, Tag
+    from app.models.literature import LanguageEnum, FontTypeEnum, ConditionEnum, UsageStatusEnum
+    from app.models.subject import subject_directions
+    from app.models.tag import news_tags
+    from app.utils.security import get_password_hash
+    from app.db.search import rebuild_statements as rebuild_search_index
+    from app.utils.tag_stats import rebuild_statements
+
+    rnd = random.Random(seed)
+    started = datetime(2025, 1, 1)
+    rows: dict = {model: [] for model in (
+        University, Direction, Kafedra, Subject, subject_directions, Literature, Tag, News, news_tags,
+    )}
+
+    rows[Tag] = [{"id": t, "name": f"tag-{t}"} for t in range(1, size.tags + 1)]
+    for u in range(1, size.universities + 1):
+        rows[University].append({"id": u, "name": f"University {u}", "address": f"Street {u}"})
+
+        first_direction = len(rows[Direction]) + 1
+        for i in range(size.directions):
+            rows[Direction].append({
+                "id": len(rows[Direction]) + 1, "number": f"{60000 + i}", "name": f"Direction {u}-{i}",
+                "course": i % 4 + 1, "student_count": rnd.randint(15, 250), "university_id": u,
+            })
+        first_kafedra = len(rows[Kafedra]) + 1
+        for i in range(size.kafedras):
+            rows[Kafedra].append({"id": len(rows[Kafedra]) + 1, "name": f"Kafedra {u}-{i}", "university_id": u})
+
+        for i in range(size.subjects):
+            subject_id = len(rows[Subject]) + 1
+            rows[Subject].append({
+                "id": subject_id, "name": f"Subject {i}", "university_id": u,
+                "kafedra_id": first_kafedra + rnd.randrange(size.kafedras),
+            })
+            picked = rnd.sample(range(size.directions), min(size.directions_per_subject, size.directions))
+            rows[subject_directions] += [{"subject_id": subject_id, "direction_id": first_direction + d} for d in picked]
+            for j in range(size.literature):
+                has_file = rnd.random() < 0.3
+                rows[Literature].append({
+                    "title": f"Book {subject_id}-{j}", "kind": rnd.choice(["textbook", "manual", "monograph"]),
+                    "author": f"Author {rnd.randint(1, 500)}", "publisher": f"Publisher {rnd.randint(1, 40)}",
+                    "language": rnd.choice(list(LanguageEnum)), "font_type": rnd.choice(list(FontTypeEnum)),
+                    "year": rnd.randint(1995, 2025), "printed_count": rnd.randint(0, 120),
+                    "condition": rnd.choice(list(ConditionEnum)), "usage_status": rnd.choice(list(UsageStatusEnum)),
+                    "file_path": f"uploads/literatures/bench-{subject_id}-{j}.pdf" if has_file else None,
+                    "subject_id": subject_id, "university_id": u,
+                })
+
+        for i in range(size.news):
+            news_id = len(rows[News]) + 1
+            rows[News].append({
+                "id": news_id, "title": f"News {u}-{i}", "university_id": u,
+                "description": " ".join(rnd.choice(["library", "books", "students", "update", "exam", "event"])
+                                        for _ in range(60)),
+                "date": started - timedelta(minutes=news_id * 37),
+            })
+            for t in rnd.sample(range(1, size.tags + 1), min(size.tags_per_news, size.tags)):
+                rows[news_tags].append({"news_id": news_id, "tag_id": t})
+
+    async with engine.begin() as conn:
+        for model, values in rows.items():
+            for i in range(0, len(values), batch):
+                await conn.execute(insert(model), values[i:i + batch])
+        for statement in [*rebuild_statements(), *rebuild_search_index(conn.dialect.name)]:
+            await conn.execute(statement)
+        await conn.execute(insert(Admin).values(
+            email=OWNER_EMAIL, hashed_password=get_password_hash(OWNER_PASSWORD), role="owner",
+        ))
+
+    counts = {getattr(model, "__tablename__", getattr(model, "name", "")): len(values) for model, values in rows.items()}
+    return {"seed": seed, "size": asdict(size), "rows": counts}
+
+
+def add_size_arguments(parser: argparse.ArgumentParser) -> None:
+    for f in fields(DatasetSize):
+        parser.add_argument(f"--{f.name.replace('_', '-')}", type=int, default=f.default)
+
+
+def size_from_args(args) -> DatasetSize:
+    return DatasetSize(**{f.name: getattr(args, f.name) for f in fields(DatasetSize)})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a seeded synthetic dataset")
+    parser.add_argument("--url", required=True, help="empty database to fill")
+    parser.add_argument("--seed", type=int, default=42)
+    add_size_arguments(parser)
+    args = parser.parse_args()
+
+    async def run():
+        engine = create_async_engine(args.url)
+        await prepare_schema(engine)
+        print(await generate(engine, size_from_args(args), seed=args.seed))
+        await engine.dispose()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
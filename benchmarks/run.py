@@ -0,0 +1,178 @@
+# Сценарии нагрузки через ASGI (без сети), результат — JSON для сравнения релизов:
+#   python -m benchmarks.run --requests 200 --concurrency 10 --output bench.json
+#   python -m benchmarks.run --compare bench-previous.json
+# Кэш ответов (ETag) по умолчанию выключен: меряем обработчики, а не попадания в кэш;
+# --response-cache — тёплые цифры с кэшем (сравнивать только с такими же отчётами)
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks.datagen import OWNER_EMAIL, OWNER_PASSWORD, add_size_arguments, size_from_args
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# (имя, метод, путь, нужна ли авторизация)
+SCENARIOS = [
+    ("literatures", "GET", "/literatures/", False),
+    ("subjects", "GET", "/subjects/", False),
+    ("owner_universities_stats", "GET", "/stats/owner-universities", True),
+    ("statistics_export", "GET", "/statistics/export", True),
+    ("login", "POST", "/auth/login", False),
+]
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    return statistics.quantiles(sorted_values, n=100, method="inclusive")[int(q) - 1]
+
+
+async def run_scenario(client, method: str, path: str, requests: int, concurrency: int, warmup: int) -> dict:
+    kwargs = {}
+    if path == "/auth/login":
+        kwargs = {"json": {"email": OWNER_EMAIL, "password": OWNER_PASSWORD}}
+
+    for _ in range(warmup):
+        (await client.request(method, path, **kwargs)).raise_for_status()
+
+    latencies: list[float] = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            started = time.perf_counter()
+            response = await client.request(method, path, **kwargs)
+            latencies.append((time.perf_counter() - started) * 1000)
+            errors += response.status_code >= 400
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": errors,
+        "throughput_rps": round(requests / elapsed, 2),
+        "p50_ms": round(_percentile(latencies, 50), 2),
+        "p95_ms": round(_percentile(latencies, 95), 2),
+        "p99_ms": round(_percentile(latencies, 99), 2),
+        "max_ms": round(latencies[-1], 2),
+    }
+
+
+async def run(args) -> dict:
+    # настройки читаются при импорте app — импортируем после подготовки окружения
+    import httpx
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from benchmarks.datagen import prepare_schema, generate
+    from app.main import app
+
+    dataset = None
+    if not args.no_seed:
+        engine = create_async_engine(os.environ["DATABASE_URL"])
+        await prepare_schema(engine)
+        dataset = await generate(engine, size_from_args(args), seed=args.seed)
+        await engine.dispose()
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as anonymous, \
+            httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as owner:
+        # refresh_token остаётся в cookie jar клиента owner
+        login = await owner.post("/auth/login", json={"email": OWNER_EMAIL, "password": OWNER_PASSWORD})
+        login.raise_for_status()
+
+        selected = set(args.scenarios.split(",")) if args.scenarios else None
+        for name, method, path, auth in SCENARIOS:
+            if selected and name not in selected:
+                continue
+            requests = args.login_requests if name == "login" else args.requests
+            results[name] = await run_scenario(
+                owner if auth else anonymous, method, path, requests, args.concurrency, args.warmup,
+            )
+            print(f"{name:<26} p50={results[name]['p50_ms']:>8} p95={results[name]['p95_ms']:>8} "
+                  f"p99={results[name]['p99_ms']:>8} ms  {results[name]['throughput_rps']:>8} rps", file=sys.stderr)
+
+    return {"meta": _meta(args, dataset), "scenarios": results}
+
+
+def _meta(args, dataset) -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "timestamp": datetime.utcnow().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "database": os.environ["DATABASE_URL"].split("://", 1)[0],
+        "concurrency": args.concurrency,
+        "response_cache": args.response_cache,
+        "dataset": dataset,
+    }
+
+
+def compare(current: dict, baseline: dict) -> None:
+    # отчёты до появления флага снимались с включённым кэшем
+    current_cache = current["meta"].get("response_cache", True)
+    baseline_cache = baseline.get("meta", {}).get("response_cache", True)
+    if current_cache != baseline_cache:
+        print(f"warning: response cache differs (current={current_cache}, baseline={baseline_cache}), "
+              "numbers are not comparable")
+    print(f"{'scenario':<26} {'metric':<15} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, result in current["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if not base:
+            continue
+        for metric in ("p50_ms", "p95_ms", "p99_ms", "throughput_rps"):
+            change = (result[metric] - base[metric]) / base[metric] * 100 if base[metric] else 0.0
+            print(f"{name:<26} {metric:<15} {base[metric]:>10} {result[metric]:>10} {change:>+7.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run latency/throughput scenarios against the ASGI app")
+    parser.add_argument("--url", help="database URL (default: temporary SQLite, seeded)")
+    parser.add_argument("--no-seed", action="store_true", help="use --url as is, already seeded by benchmarks.datagen")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--scenarios", help="comma separated subset of: " + ", ".join(s[0] for s in SCENARIOS))
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--login-requests", type=int, default=20, help="login is bcrypt-bound, keep it small")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--response-cache", action="store_true",
+                        help="keep the response cache on (warm numbers: repeated GETs are served from it)")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--compare", help="previous JSON report to compare against")
+    add_size_arguments(parser)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ.setdefault("SECRET_KEY", "bench")
+        os.environ["DATABASE_URL"] = args.url or f"sqlite+aiosqlite:///{tmp}/bench.db"
+        os.environ["RATE_LIMIT_ENABLED"] = "false"  # иначе сценарий login упрётся в 429
+        os.environ["RESPONSE_CACHE_ENABLED"] = "true" if args.response_cache else "false"
+        report = asyncio.run(run(args))
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text)
+    print(text)
+    if args.compare:
+        compare(report, json.loads(Path(args.compare).read_text()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# Время холодного старта процесса:
+#   python -m benchmarks.startup --runs 5 --output startup.json
+# import_ms — импорт app.main, ready_ms — startup-хуки + первый запрос.
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _child() -> None:
+    started = time.perf_counter()
+    from app.main import app
+    imported = time.perf_counter()
+
+    import httpx
+
+    async def ready():
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                response = await client.get("/stats/general")
+                response.raise_for_status()
+
+    asyncio.run(ready())
+    finished = time.perf_counter()
+    print(json.dumps({
+        "import_ms": (imported - started) * 1000,
+        "ready_ms": (finished - started) * 1000,
+        "openpyxl_loaded": "openpyxl" in sys.modules,
+    }))
+
+
+async def _prepare(url: str) -> None:
+    """Пустая БД на head-ревизии (как после `alembic upgrade head`)."""
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from benchmarks.datagen import prepare_schema
+
+    engine = create_async_engine(url)
+    await prepare_schema(engine)
+    await engine.dispose()
+
+
+def _summary(values: list[float]) -> dict:
+    return {
+        "median": round(statistics.median(values), 1),
+        "min": round(min(values), 1),
+        "max": round(max(values), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure import and ready time of the API process")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--url", help="migrated database to start against (default: temporary SQLite)")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    env = dict(os.environ, SECRET_KEY=os.environ.get("SECRET_KEY", "bench"))
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.url:
+            env["DATABASE_URL"] = args.url
+        else:
+            env["DATABASE_URL"] = f"sqlite+aiosqlite:///{tmp}/startup.db"
+            os.environ.update(env)
+            asyncio.run(_prepare(env["DATABASE_URL"]))
+
+        runs = []
+        for _ in range(args.runs):
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.startup", "--child"],
+                cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+            )
+            runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    report = {
+        "runs": args.runs,
+        "import_ms": _summary([r["import_ms"] for r in runs]),
+        "ready_ms": _summary([r["ready_ms"] for r in runs]),
+        "openpyxl_loaded_at_startup": any(r["openpyxl_loaded"] for r in runs),
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    if "--child" in sys.argv:
+        _child()
+    else:
+        main()
@@ -0,0 +1,84 @@
+import os
+import tempfile
+
+# Окружение — до импорта app: настройки читаются при импорте
+_db_dir = tempfile.mkdtemp(prefix="booksedu-tests-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_db_dir}/test.db"
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ["SCHEMA_STARTUP_MODE"] = "create_all"
+os.environ["RESPONSE_CACHE_ENABLED"] = "false"  # бюджеты меряют запросы к БД, а не попадания в кэш
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+os.environ["NEWS_IMAGE_PROCESSING"] = "false"
+
+import httpx
+import pytest
+
+from app.db.session import AsyncSessionLocal, Base, engine
+from app.main import app
+from app.models.direction import Direction
+from app.models.kafedra import Kafedra
+from app.models.literature import ConditionEnum, FontTypeEnum, LanguageEnum, Literature, UsageStatusEnum
+from app.models.news import News
+from app.models.subject import Subject
+from app.models.tag import Tag
+from app.models.university import University
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def db():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+async def client():
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as c:
+        yield c
+
+
+@pytest.fixture
+async def university(db):
+    """Университет с направлениями, кафедрами, предметами, литературой и новостями с тегами."""
+    uni = University(name="Test University")
+    db.add(uni)
+    await db.flush()
+
+    directions = [
+        Direction(number=f"60{i}", name=f"Direction {i}", course=1 + i % 4, student_count=20, university_id=uni.id)
+        for i in range(3)
+    ]
+    kafedras = [Kafedra(name=f"Kafedra {i}", university_id=uni.id) for i in range(3)]
+    tags = [Tag(name=f"tag{i}") for i in range(4)]
+    db.add_all(directions + kafedras + tags)
+    await db.flush()
+
+    for i in range(12):
+        subject = Subject(
+            name=f"Subject {i}", kafedra_id=kafedras[i % 3].id, university_id=uni.id,
+            directions=directions[: 1 + i % 3],
+        )
+        db.add(subject)
+        await db.flush()
+        db.add_all(
+            Literature(
+                title=f"Book {i}.{j}", kind="textbook", language=LanguageEnum.english,
+                font_type=FontTypeEnum.latin, year=2020, condition=ConditionEnum.actual,
+                usage_status=UsageStatusEnum.use, subject_id=subject.id, university_id=uni.id,
+            )
+            for j in range(i % 3)
+        )
+
+    db.add_all(
+        News(title=f"News {i}", description="text", university_id=uni.id, tags=tags[: 1 + i % 4])
+        for i in range(10)
+    )
+    await db.commit()
+    return uni
@@ -0,0 +1,81 @@
+import pytest
+from sqlalchemy import insert, select, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db.explain_check import explain_hot_queries, full_scans, seed
+from app.db.listing import prefix_match
+from app.db.session import Base
+from app.models.user import User
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_hot_queries_use_indexes():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.connect() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await seed(conn)
+        plans = await explain_hot_queries(conn)
+    await engine.dispose()
+
+    offenders = {name: plan for name, (plan, scans) in plans.items() if scans}
+    assert not offenders
+
+
+async def test_prefix_search_uses_lower_indexes():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.connect() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(User), [
+            {"email": f"user{i}@example.com", "first_name": f"First{i}", "last_name": f"Last{i}",
+             "hashed_password": "x", "role": "user"}
+            for i in range(500)
+        ])
+        await conn.execute(text("ANALYZE"))
+        search = prefix_match("User1", User.email, User.first_name, User.last_name)
+        query = select(User.id).where(search).order_by(User.id).limit(51)
+        sql = str(query.compile(engine.sync_engine, compile_kwargs={"literal_binds": True}))
+        plan = [row[-1] for row in await conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+        found = (await conn.execute(select(User.id).where(search))).scalars().all()
+        escaped = (await conn.execute(select(User.id).where(prefix_match("us_r", User.email)))).scalars().all()
+    await engine.dispose()
+
+    for index in ("ix_users_lower_email", "ix_users_lower_first_name", "ix_users_lower_last_name"):
+        assert any(line.startswith(f"SEARCH users USING INDEX {index} ") for line in plan), plan
+    assert not full_scans("sqlite", plan)
+    assert len(found) == 111  # user1, user10..19, user100..199
+    assert escaped == []  # "_" — буква, а не шаблон LIKE
+
+
+@pytest.mark.parametrize("plan, order_limit, expected", [
+    (["SEARCH news USING INDEX ix_news_university_id_date (university_id=?)"], False, []),
+    (["SCAN news"], False, ["SCAN news"]),
+    (["SCAN news USING INDEX ix_news_date"], False, ["SCAN news USING INDEX ix_news_date"]),
+    (["SCAN news USING COVERING INDEX ix_news_date"], False, ["SCAN news USING COVERING INDEX ix_news_date"]),
+    # обход индекса в порядке ORDER BY ... LIMIT останавливается после LIMIT строк
+    (["SCAN news USING INDEX ix_news_date"], True, []),
+    (["SCAN news USING INDEX ix_news_id", "USE TEMP B-TREE FOR ORDER BY"], True,
+     ["SCAN news USING INDEX ix_news_id"]),
+    (["SCAN news"], True, ["SCAN news"]),
+])
+def test_sqlite_full_scans(plan, order_limit, expected):
+    assert full_scans("sqlite", plan, order_limit) == expected
+
+
+@pytest.mark.parametrize("plan, order_limit, expected", [
+    (["Index Scan using ix_news_university_id on news  (cost=0.15..8.17 rows=1 width=4)",
+      "  Index Cond: (university_id = 1)"], False, []),
+    (["Seq Scan on news  (cost=0.00..1.01 rows=1 width=4)"], True,
+     ["Seq Scan on news  (cost=0.00..1.01 rows=1 width=4)"]),
+    (["Index Only Scan using ix_news_date on news  (cost=0.15..60.15 rows=1000 width=4)"], False,
+     ["Index Only Scan using ix_news_date on news  (cost=0.15..60.15 rows=1000 width=4)"]),
+    (["Limit  (cost=0.15..1.35 rows=20 width=4)",
+      "  ->  Index Scan Backward using ix_news_date on news  (cost=0.15..60.15 rows=1000 width=4)"], True, []),
+    (["Limit  (cost=70.0..70.1 rows=20 width=4)",
+      "  ->  Sort  (cost=70.0..72.5 rows=1000 width=4)",
+      "        Sort Key: title",
+      "        ->  Index Scan using ix_news_id on news  (cost=0.15..60.15 rows=1000 width=4)"], True,
+     ["        ->  Index Scan using ix_news_id on news  (cost=0.15..60.15 rows=1000 width=4)"]),
+])
+def test_postgresql_full_scans(plan, order_limit, expected):
+    assert full_scans("postgresql", plan, order_limit) == expected
@@ -0,0 +1,58 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from sqlalchemy import create_engine
+
+from app.db.migrations import LEGACY_CREATE_ALL_REVISION
+from app.db.session import Base
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def alembic(db_path: Path, *args: str) -> subprocess.CompletedProcess:
+    # alembic/env.py берёт DATABASE_URL из настроек — отдельный процесс со своей БД
+    env = {**os.environ, "DATABASE_URL": f"sqlite+aiosqlite:///{db_path}"}
+    return subprocess.run(
+        [sys.executable, "-m", "alembic", *args], cwd=ROOT, env=env, capture_output=True, text=True
+    )
+
+
+def assert_at_head(db_path: Path) -> None:
+    # `alembic check` падает, если схема после миграций расходится с моделями
+    result = alembic(db_path, "check")
+    assert result.returncode == 0, result.stderr
+
+
+def test_upgrade_head_on_empty_database(tmp_path):
+    db_path = tmp_path / "fresh.db"
+
+    result = alembic(db_path, "upgrade", "head")
+
+    assert result.returncode == 0, result.stderr
+    assert_at_head(db_path)
+
+
+def test_upgrade_head_after_stamping_create_all_database(tmp_path):
+    db_path = tmp_path / "legacy.db"
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+
+    assert alembic(db_path, "stamp", LEGACY_CREATE_ALL_REVISION).returncode == 0
+    result = alembic(db_path, "upgrade", "head")
+
+    assert result.returncode == 0, result.stderr
+    assert_at_head(db_path)
+
+
+def test_downgrade_to_base_and_back(tmp_path):
+    db_path = tmp_path / "fresh.db"
+    assert alembic(db_path, "upgrade", "head").returncode == 0
+
+    result = alembic(db_path, "downgrade", "base")
+    assert result.returncode == 0, result.stderr
+
+    result = alembic(db_path, "upgrade", "head")
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,50 @@
+import pytest
+
+from app.db.instrumentation import query_budget
+
+pytestmark = pytest.mark.anyio
+
+
+# Бюджеты не зависят от объёма данных: рост числа запросов — это N+1
+async def test_subjects_list(client, university):
+    with query_budget(1, max_repeats=1):
+        response = await client.get("/subjects/")
+    assert response.status_code == 200
+    assert len(response.json()) == 12
+    assert all(subject["direction_ids"] for subject in response.json())
+
+
+async def test_news_list(client, university):
+    with query_budget(2, max_repeats=1):
+        response = await client.get("/news/")
+    assert response.status_code == 200
+    assert len(response.json()) == 10
+    assert all(news["tags"] for news in response.json())
+
+
+async def test_university_tree(client, university):
+    with query_budget(5, max_repeats=1):
+        response = await client.get(f"/universities/{university.id}/tree")
+    assert response.status_code == 200
+    tree = response.json()
+    assert len(tree["directions"]) == 3
+    assert sum(len(kafedra["subjects"]) for kafedra in tree["kafedras"]) == 12
+
+
+async def test_literature_list(client, university):
+    with query_budget(3, max_repeats=1):
+        response = await client.get("/literatures/")
+    assert response.status_code == 200
+    literature = response.json()
+    assert len(literature) == sum(i % 3 for i in range(12))
+    assert all(item["subject"]["id"] == item["subject_id"] for item in literature)
+    assert all(item["subject"]["directions"] for item in literature)
+
+
+async def test_direction_list(client, university):
+    with query_budget(2, max_repeats=1):
+        response = await client.get("/directions/")
+    assert response.status_code == 200
+    directions = response.json()
+    assert len(directions) == 3
+    assert sorted(len(direction["subjects"]) for direction in directions) == [4, 8, 12]
@@ -0,0 +1,37 @@
+import pytest
+
+from app.core.config import settings
+from app.utils import response_cache
+from app.utils.response_cache import MemoryCacheBackend, set_cache_backend
+
+pytestmark = pytest.mark.anyio
+
+ORIGIN = "http://127.0.0.1:5173"
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_ENABLED", True)
+    set_cache_backend(MemoryCacheBackend())
+    yield
+    monkeypatch.setattr(response_cache, "_backend", None)
+
+
+def assert_cors(response):
+    assert response.headers.get("access-control-allow-origin") == ORIGIN
+    assert response.headers.get("access-control-allow-credentials") == "true"
+
+
+async def test_cached_responses_keep_cors_headers(client, university, cache):
+    miss = await client.get("/universities/", headers={"Origin": ORIGIN})
+    assert miss.headers["x-cache"] == "MISS"
+    assert_cors(miss)
+
+    hit = await client.get("/universities/", headers={"Origin": ORIGIN})
+    assert hit.headers["x-cache"] == "HIT"
+    assert hit.json() == miss.json()
+    assert_cors(hit)
+
+    not_modified = await client.get("/universities/", headers={"Origin": ORIGIN, "If-None-Match": miss.headers["etag"]})
+    assert not_modified.status_code == 304
+    assert_cors(not_modified)
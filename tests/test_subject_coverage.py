@@ -0,0 +1,25 @@
+import pytest
+
+from app.routers.subject import _coverage_query
+
+pytestmark = pytest.mark.anyio
+
+
+async def coverage(db, university_id=None, kafedra_id=None):
+    query, _ = _coverage_query(university_id, kafedra_id, missing_only=False)
+    return {row.id: row for row in await db.execute(query)}
+
+
+# Фильтр внутри агрегатов не должен менять цифры — только объём прохода
+async def test_scoped_coverage_matches_unscoped(db, university):
+    everything = await coverage(db)
+    by_university = await coverage(db, university_id=university.id)
+    assert by_university == everything
+
+    kafedra_id = next(row.kafedra_id for row in everything.values() if row.literature_count)
+    by_kafedra = await coverage(db, university_id=university.id, kafedra_id=kafedra_id)
+    assert by_kafedra == {id_: row for id_, row in everything.items() if row.kafedra_id == kafedra_id}
+
+
+async def test_coverage_of_other_university_is_empty(db, university):
+    assert await coverage(db, university_id=university.id + 1) == {}